@@ -9,20 +9,65 @@ class Settings:
 
     def __init__(self) -> None:
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.collection_cache_ttl_seconds = int(os.getenv("COLLECTION_CACHE_TTL_SECONDS", "3600"))
+        self.collection_export_batch_size = int(os.getenv("COLLECTION_EXPORT_BATCH_SIZE", "1000"))
+        self.collection_import_max_rows = int(os.getenv("COLLECTION_IMPORT_MAX_ROWS", "50000"))
+        self.collection_sync_page_size = int(os.getenv("COLLECTION_SYNC_PAGE_SIZE", "1000"))
+        self.collection_tombstone_retention_days = int(os.getenv("COLLECTION_TOMBSTONE_RETENTION_DAYS", "90"))
+        self.redis_max_connections = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+        self.redis_pool_timeout = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+        self.redis_socket_timeout = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
         self.image_ttl_seconds = int(os.getenv("IMAGE_TTL_SECONDS", "900"))
+        self.image_store_backend = os.getenv("IMAGE_STORE_BACKEND", "redis").lower()
+        self.image_store_dir = os.getenv("IMAGE_STORE_DIR", "storage/images")
+        self.image_sweep_interval_minutes = int(os.getenv("IMAGE_SWEEP_INTERVAL_MINUTES", "10"))
+        self.analysis_draft_retention_hours = int(os.getenv("ANALYSIS_DRAFT_RETENTION_HOURS", "72"))
+        self.analysis_purge_after_days = int(os.getenv("ANALYSIS_PURGE_AFTER_DAYS", "30"))
+        self.analysis_sweep_batch_size = int(os.getenv("ANALYSIS_SWEEP_BATCH_SIZE", "500"))
+        self.image_store_max_edge = int(os.getenv("IMAGE_STORE_MAX_EDGE", "2048"))
+        self.image_store_format = os.getenv("IMAGE_STORE_FORMAT", "webp")
+        self.image_store_quality = int(os.getenv("IMAGE_STORE_QUALITY", "82"))
+        self.image_preview_edge = int(os.getenv("IMAGE_PREVIEW_EDGE", "640"))
+        self.analysis_thumbnail_edge = int(os.getenv("ANALYSIS_THUMBNAIL_EDGE", "320"))
+        self.image_keep_original = os.getenv("IMAGE_KEEP_ORIGINAL", "0") == "1"
+        self.image_touch_interval_seconds = int(os.getenv("IMAGE_TOUCH_INTERVAL_SECONDS", "60"))
         self.analysis_max_candidates = int(os.getenv("ANALYSIS_MAX_CANDIDATES", "5"))
         self.analysis_confidence_threshold = float(
             os.getenv("ANALYSIS_CONFIDENCE_THRESHOLD", "0.82")
         )
+        self.analysis_auto_accept_margin = float(os.getenv("ANALYSIS_AUTO_ACCEPT_MARGIN", "0.1"))
         self.max_cards_per_image = int(os.getenv("MAX_CARDS_PER_IMAGE", "4"))
+        self.analysis_batch_time_budget_seconds = float(
+            os.getenv("ANALYSIS_BATCH_TIME_BUDGET_SECONDS", "45")
+        )
         self.analysis_output_dir = os.getenv("ANALYSIS_OUTPUT_DIR", "output")
+        self.analysis_report_include_ocr_lines = os.getenv("ANALYSIS_REPORT_INCLUDE_OCR_LINES", "0") == "1"
+        self.analysis_report_retention_days = int(os.getenv("ANALYSIS_REPORT_RETENTION_DAYS", "30"))
+        self.analysis_report_max_mb = int(os.getenv("ANALYSIS_REPORT_MAX_MB", "512"))
+        self.analysis_telemetry_db = os.getenv("ANALYSIS_TELEMETRY_DB", "output/telemetry.sqlite3")
         self.analysis_languages = [
             lang.strip()
             for lang in os.getenv("ANALYSIS_LANGUAGES", "fr,en").split(",")
             if lang.strip()
         ] or ["fr"]
+        self.analysis_supported_languages = [
+            lang.strip()
+            for lang in os.getenv("ANALYSIS_SUPPORTED_LANGUAGES", "fr,en,de,es,it").split(",")
+            if lang.strip()
+        ]
+        self.ocr_max_resident_readers = max(1, int(os.getenv("OCR_MAX_RESIDENT_READERS", "2")))
+        self.analysis_rectify_crops = os.getenv("ANALYSIS_RECTIFY_CROPS", "1") == "1"
+        self.analysis_card_width = int(os.getenv("ANALYSIS_CARD_WIDTH", "630"))
+        self.analysis_card_height = int(os.getenv("ANALYSIS_CARD_HEIGHT", "880"))
+        self.analysis_min_sharpness = float(os.getenv("ANALYSIS_MIN_SHARPNESS", "60"))
+        self.analysis_max_glare_ratio = float(os.getenv("ANALYSIS_MAX_GLARE_RATIO", "0.12"))
+        self.analysis_skip_low_quality = os.getenv("ANALYSIS_SKIP_LOW_QUALITY", "0") == "1"
         self.analysis_visual_matching = os.getenv("ANALYSIS_VISUAL_MATCHING", "1") == "1"
         self.card_asset_base_url = os.getenv("CARD_ASSET_BASE_URL")
+        self.ocr_cache_enabled = os.getenv("OCR_CACHE_ENABLED", "1") == "1"
+        self.ocr_cache_ttl_seconds = int(os.getenv("OCR_CACHE_TTL_SECONDS", "604800"))
+        self.ocr_cache_hash_size = int(os.getenv("OCR_CACHE_HASH_SIZE", "16"))
+        self.ocr_cache_max_distance = int(os.getenv("OCR_CACHE_MAX_DISTANCE", "10"))
 
 
 @lru_cache(maxsize=1)
@@ -10,6 +10,7 @@ from app.routes.imports import router as imports_router
 from app.routes.user_cards import router as user_cards_router
 from app.database import engine, Base
 from app.scheduler import start_scheduler
+from app.services.redis_client import get_pool_metrics
 
 # Créer les tables au démarrage
 Base.metadata.create_all(bind=engine)
@@ -49,4 +50,4 @@ app.include_router(user_cards_router)
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "redis_pool": get_pool_metrics()}
@@ -8,6 +8,7 @@ from app.models.card import Card
 from app.models.analysis_image import AnalysisImage
 from app.models.card_draft import CardDraft
 from app.models.user_card import UserCard
+from app.models.user_card_tombstone import UserCardTombstone
 from app.models.user_master_set import UserMasterSet
 from app.models.sealed_item import SealedItem
 from app.models.sealed_item_locale import SealedItemLocale
@@ -21,6 +22,7 @@ __all__ = [
     "AnalysisImage",
     "CardDraft",
     "UserCard",
+    "UserCardTombstone",
     "UserMasterSet",
     "SealedItem",
     "SealedItemLocale",
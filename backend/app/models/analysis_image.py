@@ -1,6 +1,6 @@
 import uuid
-from datetime import datetime, timedelta
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +14,9 @@ class AnalysisImage(Base):
     """
 
     __tablename__ = "analysis_images"
+    __table_args__ = (
+        Index("ix_analysis_images_status_expires_at", "status", "expires_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -22,6 +25,10 @@ class AnalysisImage(Base):
     content_type = Column(String, nullable=False, default="image/jpeg")
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
+    original_size_bytes = Column(Integer, nullable=True)
+    stored_size_bytes = Column(Integer, nullable=True)
+    original_redis_key = Column(String, nullable=True)
+    content_sha256 = Column(String(64), nullable=True)
     ttl_seconds = Column(Integer, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
     status = Column(String, nullable=False, default="stored")
@@ -36,3 +43,16 @@ class AnalysisImage(Base):
 
     def refresh_ttl(self) -> None:
         self.expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+
+    def ttl_refresh_due(self, min_interval_seconds: int) -> bool:
+        """
+        Vrai si le dernier rafraîchissement du TTL date d'au moins
+        `min_interval_seconds` : évite un commit à chaque affichage.
+        """
+        if self.expires_at is None:
+            return True
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        return remaining < self.ttl_seconds - min_interval_seconds
@@ -1,7 +1,7 @@
 """
 Modèle Card - Représente une carte Pokémon individuelle
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -15,6 +15,9 @@ class Card(Base):
     - Une carte appartient à un set
     """
     __tablename__ = "cards"
+    __table_args__ = (
+        Index("ix_cards_set_id_local_id_id", "set_id", "local_id", "id"),
+    )
 
     id = Column(String, primary_key=True)  # Ex: "sv3pt5-1"
     local_id = Column(String, nullable=False)  # Numéro dans le set (ex: "001")
@@ -1,6 +1,6 @@
 import enum
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey, JSON, String, Float, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Index, JSON, String, Float, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -10,6 +10,7 @@ from app.database import Base
 
 class CardDraftStatus(str, enum.Enum):
     pending = "pending"
+    deferred = "deferred"
     awaiting_validation = "awaiting_validation"
     validated = "validated"
     rejected = "rejected"
@@ -23,11 +24,14 @@ class DraftSubject(str, enum.Enum):
 
 class CardDraft(Base):
     __tablename__ = "card_drafts"
+    __table_args__ = (
+        Index("ix_card_drafts_status_created_at", "status", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     batch_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    image_id = Column(UUID(as_uuid=True), ForeignKey("analysis_images.id"), nullable=False)
+    image_id = Column(UUID(as_uuid=True), ForeignKey("analysis_images.id"), nullable=False, index=True)
     status = Column(String, nullable=False, default=CardDraftStatus.awaiting_validation.value)
     candidates = Column(JSON, nullable=False, default=list)
     top_candidate_id = Column(String, nullable=True)
@@ -1,12 +1,16 @@
 import enum
 import uuid
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric, String
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, literal_column, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
 
+# Identifiant 64 bits (xid8) de la transaction d'écriture, ordonné par la
+# synchronisation incrémentale (voir CollectionSyncService).
+CURRENT_XACT_ID = "pg_current_xact_id()::text::bigint"
+
 
 class CardCondition(str, enum.Enum):
     mint = "mint"
@@ -19,11 +23,16 @@ class CardCondition(str, enum.Enum):
 
 class UserCard(Base):
     __tablename__ = "user_cards"
+    __table_args__ = (
+        Index("ix_user_cards_user_id_card_id", "user_id", "card_id", unique=True),
+        Index("ix_user_cards_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_user_cards_user_id_change_xid_id", "user_id", "change_xid", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     card_id = Column(String, ForeignKey("cards.id"), nullable=False, index=True)
-    draft_id = Column(UUID(as_uuid=True), ForeignKey("card_drafts.id"), nullable=True)
+    draft_id = Column(UUID(as_uuid=True), ForeignKey("card_drafts.id"), nullable=True, index=True)
     quantity = Column(Integer, nullable=False, default=1)
     condition = Column(String, nullable=False, default=CardCondition.near_mint.value)
     price_paid = Column(Numeric(10, 2), nullable=True)
@@ -31,6 +40,9 @@ class UserCard(Base):
     source = Column(String, nullable=True)
     notes = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.clock_timestamp(), onupdate=func.clock_timestamp())
+    change_xid = Column(
+        BigInteger, nullable=False, server_default=text(CURRENT_XACT_ID), onupdate=literal_column(CURRENT_XACT_ID)
+    )
 
     source_draft = relationship("CardDraft", back_populates="selection")
@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+from app.models.user_card import CURRENT_XACT_ID
+
+
+class UserCardTombstone(Base):
+    """
+    Trace d'une user_card supprimée, servie par la synchronisation incrémentale
+    (`GET /user-cards/changes`) puis purgée après la durée de rétention.
+    """
+    __tablename__ = "user_card_tombstones"
+    __table_args__ = (
+        Index("ix_user_card_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+        Index("ix_user_card_tombstones_user_id_change_xid", "user_id", "change_xid"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True)  # id de la user_card supprimée
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    card_id = Column(String, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.clock_timestamp())
+    change_xid = Column(BigInteger, nullable=False, server_default=text(CURRENT_XACT_ID))
@@ -10,7 +10,9 @@ from app.database import get_db
 from app.models.card import Card
 from app.models.set import Set
 from app.schemas.card import CardCreate, CardResponse, CardUpdate, CardsListResponse
+from app.services.collection_cache import CollectionCache
 from app.utils.dependencies import get_current_user
+from app.utils.pagination import after, decode_cursor, next_cursor
 from app.models.user import User
 
 router = APIRouter(
@@ -31,6 +33,8 @@ def get_all_cards(
     type: Optional[str] = Query(None, description="Type Pokémon (Fire, Water, etc.)"),
     stage: Optional[str] = None,
     local_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (remplace skip)"),
+    include_total: bool = Query(False, description="Calculer le total aussi en mode curseur"),
     db: Session = Depends(get_db)
 ):
     """
@@ -45,6 +49,10 @@ def get_all_cards(
     - type : Filtrer par type Pokémon
     - stage : Filtrer par stage (Basic, Stage1, Stage2)
     - local_id : Recherche par numéro dans le set
+    
+    Pagination : `skip`/`limit` (offset, total toujours calculé) ou
+    `cursor`/`limit` (keyset sur (set_id, local_id, id), total seulement
+    si `include_total`) ; `next_cursor` est renvoyé dans les deux cas
     """
     query = db.query(Card).options(joinedload(Card.set))
     
@@ -67,11 +75,18 @@ def get_all_cards(
     if local_id:
         query = query.filter(Card.local_id.ilike(f"%{local_id}%"))
     
-    # Compter le total avant pagination
-    total = query.count()
+    # Compter le total avant pagination (coûteux : évité en mode curseur)
+    total = query.count() if not cursor or include_total else None
     
-    # Appliquer pagination
-    cards = query.offset(skip).limit(limit).all()
+    # Appliquer pagination : keyset si un curseur est fourni, offset sinon
+    keyset = (Card.set_id, Card.local_id, Card.id)
+    query = query.order_by(*keyset)
+    if cursor:
+        query = query.filter(after(keyset, decode_cursor(cursor, (str, str, str))))
+    else:
+        query = query.offset(skip)
+    cards = query.limit(limit + 1).all()
+    cursor_next = next_cursor(cards, limit, lambda card: (card.set_id, card.local_id, card.id))
     
     # Convertir les objets SQLAlchemy en schémas Pydantic
     card_responses = [CardResponse.model_validate(card) for card in cards]
@@ -80,7 +95,8 @@ def get_all_cards(
         items=card_responses,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=cursor_next
     )
 
 
@@ -125,6 +141,7 @@ def create_card(
     )
     db.add(db_card)
     db.commit()
+    CollectionCache().bump_catalog()
     db.refresh(db_card)
     
     return db_card
@@ -168,6 +185,7 @@ def update_card(
         db_card.set_id = card_update.set_id
     
     db.commit()
+    CollectionCache().bump_catalog()
     db.refresh(db_card)
     return db_card
 
@@ -187,4 +205,5 @@ def delete_card(
     
     db.delete(db_card)
     db.commit()
+    CollectionCache().bump_catalog()
     return None
\ No newline at end of file
@@ -3,17 +3,18 @@ Routes d'import et d'analyse d'images FilePond -> FastAPI.
 """
 from __future__ import annotations
 
-import io
+import hashlib
 import logging
+import time
 import uuid
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
-from PIL import Image
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import insert
 from sqlalchemy.orm import Session, selectinload
 
 from app.config import get_settings
@@ -24,21 +25,31 @@ from app.models.card_draft import CardDraft, CardDraftStatus, DraftSubject
 from app.models.user import User
 from app.models.user_card import CardCondition, UserCard
 from app.schemas.imports import (
+    BatchSelectionRequest,
+    BatchSelectionResponse,
     CardCandidate,
     CardDraftResponse,
     CardSelectionRequest,
     CardSelectionResponse,
     ImageBatchResponse,
+    SelectionError,
     UserCardResponse,
     UserMasterSetResponse,
 )
 from app.services.card_matching import CardMatchingService
 from app.services.card_similarity import CardVisualMatcher
+from app.services.card_text import parse_languages
+from app.services.collection_cache import CollectionCache
 from app.services.image_analysis import DetectedCardFeatures, ImageAnalyzer
-from app.services.image_store import ImageStorageService
+from app.services.image_codec import encode_image, preview_content_type
+from app.services.image_store import get_image_storage
 from app.services.master_set import MasterSetProgressService
+from app.services.ocr_cache import OcrResultCache
 from app.services.reporting import AnalysisReportWriter
+from app.services.telemetry import StageTimer, get_telemetry_store
+from app.services.user_cards import UserCardWriter
 from app.utils.dependencies import get_current_user
+from app.utils.http_cache import blob_response, content_etag, etag_matches, not_modified, quote_etag
 
 router = APIRouter(
     prefix="/imports",
@@ -61,6 +72,8 @@ def _draft_to_response(draft: CardDraft) -> CardDraftResponse:
         batch_id=draft.batch_id,
         image_id=draft.image_id,
         image_url=f"/imports/images/{draft.image_id}",
+        preview_url=f"/imports/images/{draft.image_id}/preview",
+        crop_url=f"/imports/drafts/{draft.id}/crop",
         status=draft.status,
         subject_type=draft.subject_type,
         candidates=candidate_objects,
@@ -71,10 +84,75 @@ def _draft_to_response(draft: CardDraft) -> CardDraftResponse:
     )
 
 
+def _analyze_detection(
+    detection: DetectedCardFeatures,
+    selected_subject: DraftSubject,
+    matcher: CardMatchingService,
+) -> tuple[str, list, dict]:
+    """
+    Calcule (statut, candidats, métadonnées) d'un draft à partir d'une détection.
+    """
+    candidates_payload: list = []
+    status_value = CardDraftStatus.pending.value
+    metadata_payload = detection.to_payload()
+
+    if detection.deferred:
+        status_value = CardDraftStatus.deferred.value
+        metadata_payload["note"] = "Analyse différée, disponible à la demande"
+    elif detection.ocr_skipped:
+        metadata_payload["note"] = "Photo floue ou avec reflets, reprenez la photo"
+    elif selected_subject == DraftSubject.cards:
+        candidates = matcher.find_candidates(
+            probable_name=detection.probable_name,
+            local_number=detection.local_number,
+            set_hint=detection.set_hint,
+            hp_hint=detection.hp_hint,
+            type_hint=detection.type_hint,
+            illustrator_hint=detection.illustrator_hint,
+            release_year=detection.release_year,
+            crop_image=detection.image_patch,
+        )
+        candidates_payload = [candidate.to_dict() for candidate in candidates]
+        metadata_payload["candidates_scored"] = matcher.last_scored_count
+        status_value = (
+            CardDraftStatus.awaiting_validation.value
+            if candidates_payload
+            else CardDraftStatus.pending.value
+        )
+        logger.info(
+            "  🔎 Détection %s → %s candidats (top=%s | score=%.2f)",
+            detection.bounding_box,
+            len(candidates_payload),
+            candidates_payload[0]["card_id"] if candidates_payload else None,
+            candidates_payload[0]["score"] if candidates_payload else 0.0,
+        )
+    else:
+        metadata_payload["note"] = "Analyse des items scellés non encore disponible"
+
+    return status_value, candidates_payload, metadata_payload
+
+
+def _auto_accept_candidate(candidates_payload: list, threshold: float, margin: float) -> Optional[dict]:
+    """
+    Premier candidat retenu d'office si son score atteint `threshold` et
+    devance le second d'au moins `margin`.
+    """
+    if not candidates_payload:
+        return None
+    top = candidates_payload[0]
+    runner_up_score = candidates_payload[1]["score"] if len(candidates_payload) > 1 else 0.0
+    if top["score"] >= threshold and top["score"] - runner_up_score >= margin:
+        return top
+    return None
+
+
 @router.post("/batches", response_model=ImageBatchResponse, status_code=status.HTTP_201_CREATED)
 async def create_import_batch(
+    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     subject_type: str = Form("cards"),
+    languages: Optional[str] = Form(None),
+    auto_accept: bool = Form(False),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -86,54 +164,95 @@ async def create_import_batch(
     except ValueError:
         raise HTTPException(status_code=400, detail="Type d'import invalide")
 
-    storage = ImageStorageService()
+    try:
+        ocr_languages = parse_languages(languages) or parse_languages(current_user.ocr_languages)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    storage = get_image_storage()
     analyzer = ImageAnalyzer()
     matcher = CardMatchingService(db, visual_matcher=visual_matcher)
     settings = get_settings()
 
     batch_id = uuid.uuid4()
-    created_drafts: List[CardDraft] = []
+    timer = StageTimer()
+    started = time.perf_counter()
+    image_rows: List[dict] = []
+    draft_rows: List[dict] = []
+    auto_rows: List[dict] = []
+    derived_blobs: List[tuple[str, bytes]] = []
+    budget = settings.analysis_batch_time_budget_seconds
+    deadline = time.monotonic() + budget if budget > 0 else None
 
     logger.info(
-        "🚀 Lancement analyse batch=%s type=%s (user=%s, fichiers=%s)",
+        "🚀 Lancement analyse batch=%s type=%s (user=%s, fichiers=%s, langues=%s)",
         batch_id,
         selected_subject.value,
         current_user.id,
         len(files),
+        ocr_languages or settings.analysis_languages,
     )
 
-    for index, uploaded in enumerate(files, start=1):
-        content = await uploaded.read()
-        if not content:
-            logger.warning("⚠️  Fichier #%s vide (%s), ignoré", index, uploaded.filename)
-            continue
+    uploads = []
+    with timer.stage("read"):
+        for index, uploaded in enumerate(files, start=1):
+            content = await uploaded.read()
+            if not content:
+                logger.warning("⚠️  Fichier #%s vide (%s), ignoré", index, uploaded.filename)
+                continue
+            uploads.append((index, uploaded, content))
+
+    # Copie de travail compacte (grand côté borné, WebP/JPEG) : c'est elle qui
+    # est stockée, analysée et servie ; l'original n'est gardé que sur option.
+    with timer.stage("encode"):
+        encoded_images = [
+            encode_image(
+                content,
+                fallback_content_type=uploaded.content_type or "image/jpeg",
+                preview_edge=settings.image_preview_edge,
+            )
+            for _, uploaded, content in uploads
+        ]
+    originals = [content for _, _, content in uploads] if settings.image_keep_original else None
+
+    # Un seul aller-retour Redis pour l'ensemble du lot.
+    with timer.stage("store"):
+        stored_keys = storage.save_many([encoded.data for encoded in encoded_images], originals=originals)
 
-        image_uuid, redis_key = storage.save_image(content)
-        pil_image = Image.open(io.BytesIO(content))
-        width, height = pil_image.size
+    for (index, uploaded, _), encoded, (image_uuid, redis_key) in zip(uploads, encoded_images, stored_keys):
+        content = encoded.data
+        width, height = encoded.width, encoded.height
 
         logger.info(
-            "📸 Image #%s (%s) résolutions %sx%s",
+            "📸 Image #%s (%s) résolutions %sx%s (%s Ko → %s Ko)",
             index,
             uploaded.filename or image_uuid,
             width,
             height,
+            encoded.original_size // 1024,
+            encoded.stored_size // 1024,
         )
 
-        image_record = AnalysisImage(
-            id=uuid.UUID(image_uuid),
-            user_id=current_user.id,
-            redis_key=redis_key,
-            filename=uploaded.filename or f"image-{image_uuid}.png",
-            content_type=uploaded.content_type or "image/png",
-            width=width,
-            height=height,
-            ttl_seconds=settings.image_ttl_seconds,
-            expires_at=datetime.utcnow() + timedelta(seconds=settings.image_ttl_seconds),
-            status="stored",
-        )
-        db.add(image_record)
-        db.flush()
+        image_id = uuid.UUID(image_uuid)
+        image_row = {
+            "id": image_id,
+            "user_id": current_user.id,
+            "redis_key": redis_key,
+            "original_redis_key": storage.original_key(redis_key) if originals is not None else None,
+            "filename": uploaded.filename or f"image-{image_uuid}.png",
+            "content_type": encoded.content_type,
+            "width": width,
+            "height": height,
+            "original_size_bytes": encoded.original_size,
+            "stored_size_bytes": encoded.stored_size,
+            "content_sha256": hashlib.sha256(encoded.data).hexdigest(),
+            "ttl_seconds": settings.image_ttl_seconds,
+            "expires_at": datetime.utcnow() + timedelta(seconds=settings.image_ttl_seconds),
+            "status": "stored",
+        }
+        image_rows.append(image_row)
+        if encoded.preview:
+            derived_blobs.append((storage.preview_key(redis_key), encoded.preview))
 
         if selected_subject == DraftSubject.sealed:
             logger.info("📦 Image marquée comme item scellé (non géré pour l'instant)")
@@ -149,7 +268,14 @@ async def create_import_batch(
                 )
             ]
         else:
-            detections = analyzer.analyze(content, subject_type=selected_subject.value)
+            with timer.stage("analyze"):
+                detections = analyzer.analyze(
+                    content,
+                    subject_type=selected_subject.value,
+                    languages=ocr_languages,
+                    deadline=deadline,
+                    max_cards=settings.max_cards_per_image,
+                )
 
         if not detections:
             logger.warning("❔ Aucune détection – fallback pleine image")
@@ -165,72 +291,107 @@ async def create_import_batch(
                 )
             ]
 
-        for detection in detections[: settings.max_cards_per_image]:
-            candidates_payload = []
-            top_candidate_id = None
-            top_candidate_score = None
-            status_value = CardDraftStatus.pending.value
-            metadata_payload = detection.to_payload()
-
-            if selected_subject == DraftSubject.cards:
-                candidates = matcher.find_candidates(
-                    probable_name=detection.probable_name,
-                    local_number=detection.local_number,
-                    set_hint=detection.set_hint,
-                    hp_hint=detection.hp_hint,
-                    type_hint=detection.type_hint,
-                    illustrator_hint=detection.illustrator_hint,
-                    release_year=detection.release_year,
-                    crop_image=detection.image_patch,
+        for detection in detections:
+            # Budget dépassé : seules les zones sans OCR sont différées, une
+            # extraction déjà calculée va jusqu'au matching et est conservée.
+            if (
+                not detection.deferred
+                and not detection.analyzed
+                and deadline is not None
+                and time.monotonic() >= deadline
+            ):
+                detection.deferred = True
+                detection.deferred_reason = "time_budget"
+            with timer.stage("match"):
+                status_value, candidates_payload, metadata_payload = _analyze_detection(
+                    detection,
+                    selected_subject,
+                    matcher,
                 )
-                candidates_payload = [candidate.to_dict() for candidate in candidates]
-                status_value = (
-                    CardDraftStatus.awaiting_validation.value
-                    if candidates_payload
-                    else CardDraftStatus.pending.value
+            top_candidate_id = candidates_payload[0]["card_id"] if candidates_payload else None
+            top_candidate_score = candidates_payload[0]["score"] if candidates_payload else None
+
+            draft_id = uuid.uuid4()
+            if detection.thumbnail:
+                derived_blobs.append((storage.crop_key(redis_key, draft_id), detection.thumbnail))
+
+            accepted = None
+            if auto_accept and status_value == CardDraftStatus.awaiting_validation.value:
+                accepted = _auto_accept_candidate(
+                    candidates_payload,
+                    settings.analysis_confidence_threshold,
+                    settings.analysis_auto_accept_margin,
                 )
-                if candidates_payload:
-                    top_candidate_id = candidates_payload[0]["card_id"]
-                    top_candidate_score = candidates_payload[0]["score"]
-                logger.info(
-                    "  🔎 Détection %s → %s candidats (top=%s | score=%.2f)",
-                    detection.bounding_box,
-                    len(candidates_payload),
-                    top_candidate_id,
-                    top_candidate_score or 0.0,
+            if accepted:
+                status_value = CardDraftStatus.validated.value
+                metadata_payload["auto_accepted"] = True
+                auto_rows.append(
+                    {
+                        "user_id": current_user.id,
+                        "card_id": accepted["card_id"],
+                        "draft_id": draft_id,
+                        "quantity": 1,
+                        "condition": CardCondition.near_mint.value,
+                        "source": "import_auto",
+                    }
                 )
-            else:
-                metadata_payload["note"] = "Analyse des items scellés non encore disponible"
-
-            draft = CardDraft(
-                batch_id=batch_id,
-                user_id=current_user.id,
-                image_id=image_record.id,
-                status=status_value,
-                candidates=candidates_payload,
-                top_candidate_id=top_candidate_id,
-                top_candidate_score=top_candidate_score,
-                detected_metadata=metadata_payload,
-                subject_type=selected_subject.value,
+
+            draft_rows.append(
+                {
+                    "id": draft_id,
+                    "batch_id": batch_id,
+                    "user_id": current_user.id,
+                    "image_id": image_id,
+                    "status": status_value,
+                    "candidates": candidates_payload,
+                    "top_candidate_id": top_candidate_id,
+                    "top_candidate_score": top_candidate_score,
+                    "selected_card_id": accepted["card_id"] if accepted else None,
+                    "detected_metadata": metadata_payload,
+                    "subject_type": selected_subject.value,
+                }
             )
-            db.add(draft)
-            created_drafts.append(draft)
 
-        image_record.status = "analyzed"
+        image_row["status"] = "analyzed"
 
-    db.commit()
-    for draft in created_drafts:
-        db.refresh(draft)
+    # Persistance en un nombre constant d'allers-retours : executemany pour les
+    # images, INSERT ... RETURNING pour récupérer created_at des drafts.
+    # Aperçus et vignettes par draft : un seul aller-retour supplémentaire.
+    with timer.stage("store"):
+        storage.save_derived(derived_blobs)
+
+    created_drafts: List[CardDraft] = []
+    with timer.stage("persist"):
+        if image_rows:
+            db.execute(insert(AnalysisImage), image_rows)
+        if draft_rows:
+            created_drafts = list(
+                db.scalars(
+                    insert(CardDraft).returning(CardDraft, sort_by_parameter_order=True),
+                    draft_rows,
+                )
+            )
+        # Validation automatique : upsert UserCard en bulk et une mise à jour par set,
+        # dans la même transaction que les drafts.
+        if auto_rows:
+            UserCardWriter(db).upsert(current_user.id, auto_rows)
+    draft_responses = [_draft_to_response(d) for d in created_drafts]
 
     report_payload = {
         "batch_id": str(batch_id),
         "user_id": current_user.id,
         "subject_type": selected_subject.value,
+        "languages": ocr_languages or settings.analysis_languages,
         "created_at": datetime.utcnow().isoformat(),
         "stats": {
             "files": len(files),
+            "original_bytes": sum(encoded.original_size for encoded in encoded_images),
+            "stored_bytes": sum(encoded.stored_size for encoded in encoded_images),
             "drafts": len(created_drafts),
+            "deferred": sum(1 for d in created_drafts if d.status == CardDraftStatus.deferred.value),
+            "auto_accepted": len(auto_rows),
         },
+        "timings": {**timer.as_dict(), "total": round((time.perf_counter() - started) * 1000, 2)},
         "drafts": [
             {
                 "draft_id": str(d.id),
@@ -245,14 +406,35 @@ async def create_import_batch(
             for d in created_drafts
         ],
     }
-    report_path = report_writer.write_batch(report_payload) if created_drafts else None
+    db.commit()
+    if auto_rows:
+        CollectionCache().bump(current_user.id)
+    report_path = None
+    if created_drafts:
+        # Écrit après l'envoi de la réponse : aucun coût sur la latence de l'import.
+        report_path = report_writer.report_path()
+        background_tasks.add_task(report_writer.write_batch, report_payload, report_path)
+        auto_selections = [(str(row["draft_id"]), row["card_id"]) for row in auto_rows]
+        if auto_selections:
+            background_tasks.add_task(report_writer.write_selections, auto_selections, True)
+        telemetry = get_telemetry_store()
+        if telemetry is not None:
+            background_tasks.add_task(telemetry.record_batch, report_payload)
+            if auto_selections:
+                background_tasks.add_task(telemetry.record_selections, auto_selections, True)
 
-    logger.info("✅ Analyse batch %s terminée (%s drafts)", batch_id, len(created_drafts))
+    logger.info(
+        "✅ Analyse batch %s terminée (%s drafts, %s validés automatiquement)",
+        batch_id,
+        len(created_drafts),
+        len(auto_rows),
+    )
 
     return ImageBatchResponse(
         batch_id=batch_id,
-        drafts=[_draft_to_response(d) for d in created_drafts],
+        drafts=draft_responses,
         report_path=str(report_path) if report_path else None,
+        auto_accepted=len(auto_rows),
     )
 
 
@@ -293,12 +475,37 @@ def get_draft(
     return _draft_to_response(draft)
 
 
+def _cache_headers(etag: str, max_age: int) -> dict:
+    return {"ETag": etag, "Cache-Control": f"private, max-age={max(max_age, 0)}"}
+
+
+def _refresh_image_ttl(image: AnalysisImage, storage, db: Session) -> None:
+    """
+    Prolonge le TTL au plus une fois par IMAGE_TOUCH_INTERVAL_SECONDS ;
+    les affichages intermédiaires ne touchent ni Redis ni Postgres.
+    """
+    if image.status == "expired" or not image.ttl_refresh_due(get_settings().image_touch_interval_seconds):
+        return
+    crop_keys = [
+        storage.crop_key(image.redis_key, draft_id)
+        for (draft_id,) in db.query(CardDraft.id).filter(CardDraft.image_id == image.id)
+    ]
+    storage.touch(image.redis_key, crop_keys)
+    image.refresh_ttl()
+    db.commit()
+
+
 @router.get("/images/{image_id}")
 def get_image(
     image_id: UUID,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """
+    Photo stockée, avec ETag fort (SHA-256 du contenu), 304 sur If-None-Match
+    sans lecture du blob, et prise en charge des requêtes Range.
+    """
     image = (
         db.query(AnalysisImage)
         .filter(AnalysisImage.id == image_id, AnalysisImage.user_id == current_user.id)
@@ -306,45 +513,202 @@ def get_image(
     )
     if not image:
         raise HTTPException(status_code=404, detail="Image introuvable")
+    if image.status == "expired":
+        raise HTTPException(status_code=404, detail="Image expirée")
+
+    storage = get_image_storage()
+    media_type = image.content_type or "image/png"
+    etag = quote_etag(image.content_sha256) if image.content_sha256 else None
+    if etag and etag_matches(request, etag):
+        _refresh_image_ttl(image, storage, db)
+        return not_modified(_cache_headers(etag, image.ttl_seconds))
+
+    local_path = storage.local_path(image.redis_key)
+    if local_path is not None:
+        # Backend fichiers : envoi direct du fichier (sendfile), Range géré par Starlette.
+        _refresh_image_ttl(image, storage, db)
+        headers = {"Cache-Control": f"private, max-age={image.ttl_seconds}"}
+        if etag:
+            headers["ETag"] = etag
+        return FileResponse(local_path, media_type=media_type, headers=headers)
 
-    storage = ImageStorageService()
     content = storage.fetch_image(image.redis_key)
     if not content:
         image.status = "expired"
         db.commit()
         raise HTTPException(status_code=404, detail="Image expirée")
 
-    storage.touch(image.redis_key)
-    image.refresh_ttl()
-    db.commit()
+    if etag is None:
+        # Images antérieures au hash en base : ETag calculé à la volée.
+        etag = content_etag(content)
+        if etag_matches(request, etag):
+            _refresh_image_ttl(image, storage, db)
+            return not_modified(_cache_headers(etag, image.ttl_seconds))
+
+    _refresh_image_ttl(image, storage, db)
+    return blob_response(request, content, media_type, _cache_headers(etag, image.ttl_seconds))
+
+
+def _stored_blob_response(
+    request: Request,
+    storage,
+    keys: List[str],
+    image: AnalysisImage,
+    not_found_detail: str,
+    db: Session,
+) -> Response:
+    """
+    Sert le premier blob dérivé disponible parmi `keys` et prolonge le TTL de
+    l'image et de ses dérivés : l'écran de revue n'affiche que les vignettes.
+    Les blobs dérivés sont immuables : leur ETag combine le hash de l'image et
+    la clé, ce qui permet de répondre 304 sans lecture. Le client revalide
+    donc sans re-télécharger.
+    """
+    _refresh_image_ttl(image, storage, db)
+    max_age = image.ttl_seconds
+    for key in keys:
+        etag = None
+        if image.content_sha256:
+            suffix = key[len(image.redis_key) + 1 :].replace(":", "-")
+            etag = quote_etag(f"{image.content_sha256[:32]}-{suffix}")
+            if etag_matches(request, etag):
+                return not_modified(_cache_headers(etag, max_age))
+        content = storage.fetch_image(key)
+        if not content:
+            continue
+        etag = etag or content_etag(content)
+        if etag_matches(request, etag):
+            return not_modified(_cache_headers(etag, max_age))
+        return blob_response(request, content, preview_content_type(), _cache_headers(etag, max_age))
+    raise HTTPException(status_code=404, detail=not_found_detail)
+
+
+@router.get("/images/{image_id}/preview")
+def get_image_preview(
+    image_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Aperçu réduit de la photo entière (grand côté IMAGE_PREVIEW_EDGE).
+    """
+    image = (
+        db.query(AnalysisImage)
+        .filter(AnalysisImage.id == image_id, AnalysisImage.user_id == current_user.id)
+        .first()
+    )
+    if not image:
+        raise HTTPException(status_code=404, detail="Image introuvable")
 
-    return StreamingResponse(
-        io.BytesIO(content),
-        media_type=image.content_type or "image/png",
+    storage = get_image_storage()
+    return _stored_blob_response(
+        request, storage, [storage.preview_key(image.redis_key)], image, "Aperçu indisponible", db
     )
 
 
-@router.post("/drafts/{draft_id}/select", response_model=CardSelectionResponse)
-def select_card(
+@router.get("/drafts/{draft_id}/crop")
+def get_draft_crop(
+    draft_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Vignette de la zone détectée pour ce draft ; à défaut, l'aperçu de la photo.
+    """
+    draft = (
+        db.query(CardDraft)
+        .options(selectinload(CardDraft.image))
+        .filter(CardDraft.id == draft_id, CardDraft.user_id == current_user.id)
+        .first()
+    )
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft introuvable")
+
+    storage = get_image_storage()
+    keys = [
+        storage.crop_key(draft.image.redis_key, draft.id),
+        storage.preview_key(draft.image.redis_key),
+    ]
+    return _stored_blob_response(request, storage, keys, draft.image, "Vignette indisponible", db)
+
+
+@router.post("/drafts/{draft_id}/analyze", response_model=CardDraftResponse)
+def analyze_deferred_draft(
     draft_id: UUID,
-    payload: CardSelectionRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """
+    Lance l'OCR et le matching d'un draft différé (budget de temps ou quota dépassé).
+    """
     draft = (
         db.query(CardDraft)
         .options(selectinload(CardDraft.image))
         .filter(CardDraft.id == draft_id, CardDraft.user_id == current_user.id)
         .first()
     )
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft introuvable")
+    if draft.status != CardDraftStatus.deferred.value:
+        raise HTTPException(status_code=400, detail="Ce draft a déjà été analysé")
+
+    storage = get_image_storage()
+    content = storage.fetch_image(draft.image.redis_key)
+    if not content:
+        raise HTTPException(status_code=404, detail="Image expirée")
+
+    metadata = draft.detected_metadata or {}
+    analyzer = ImageAnalyzer()
+    detection = analyzer.analyze_region(
+        content,
+        metadata.get("bounding_box") or (0, 0, draft.image.width or 0, draft.image.height or 0),
+        orientation=metadata.get("orientation", "original"),
+        confidence=metadata.get("confidence", 0.0),
+        languages=parse_languages(current_user.ocr_languages),
+    )
+    if detection is None:
+        raise HTTPException(status_code=422, detail="Impossible d'analyser cette zone")
+
+    matcher = CardMatchingService(db, visual_matcher=visual_matcher)
+    status_value, candidates_payload, metadata_payload = _analyze_detection(
+        detection,
+        DraftSubject(draft.subject_type),
+        matcher,
+    )
+    draft.status = status_value
+    draft.candidates = candidates_payload
+    draft.top_candidate_id = candidates_payload[0]["card_id"] if candidates_payload else None
+    draft.top_candidate_score = candidates_payload[0]["score"] if candidates_payload else None
+    draft.detected_metadata = metadata_payload
+    db.commit()
+    db.refresh(draft)
+    return _draft_to_response(draft)
+
+
+@router.get("/ocr-cache/stats", response_model=dict)
+def get_ocr_cache_stats(current_user: User = Depends(get_current_user)):
+    """
+    Compteurs hit/miss du cache OCR, pour dimensionner son TTL et la mémoire Redis.
+    """
+    return OcrResultCache().stats()
+
+
+def _check_selection(
+    draft: Optional[CardDraft],
+    card: Optional[Card],
+    payload: CardSelectionRequest,
+) -> tuple[str, Optional[Decimal]]:
+    """
+    Valide une sélection et retourne (condition, prix) ; lève HTTPException sinon.
+    """
     if not draft:
         raise HTTPException(status_code=404, detail="Draft introuvable")
     if draft.status == CardDraftStatus.validated.value:
         raise HTTPException(status_code=400, detail="Draft déjà validé")
     if draft.subject_type != DraftSubject.cards.value:
         raise HTTPException(status_code=400, detail="La validation est réservée aux cartes pour le moment")
-
-    card = db.query(Card).filter(Card.id == payload.card_id).first()
     if not card:
         raise HTTPException(status_code=404, detail="Carte introuvable")
 
@@ -354,29 +718,154 @@ def select_card(
         raise HTTPException(status_code=400, detail="Condition invalide")
 
     price_value = Decimal(str(payload.price_paid)) if payload.price_paid is not None else None
+    return condition_value, price_value
 
-    user_card = UserCard(
-        user_id=current_user.id,
-        card_id=card.id,
-        draft_id=draft.id,
-        quantity=payload.quantity,
-        condition=condition_value,
-        price_paid=price_value,
-        acquired_at=payload.acquired_at,
-        notes=payload.notes,
+
+@router.post("/drafts/{draft_id}/select", response_model=CardSelectionResponse)
+def select_card(
+    draft_id: UUID,
+    payload: CardSelectionRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    draft = (
+        db.query(CardDraft)
+        .options(selectinload(CardDraft.image))
+        .filter(CardDraft.id == draft_id, CardDraft.user_id == current_user.id)
+        .first()
     )
-    db.add(user_card)
+    card = db.query(Card).filter(Card.id == payload.card_id).first() if draft else None
+    condition_value, price_value = _check_selection(draft, card, payload)
+
+    user_card = UserCardWriter(db).upsert(
+        current_user.id,
+        [
+            {
+                "card_id": card.id,
+                "draft_id": draft.id,
+                "quantity": payload.quantity,
+                "condition": condition_value,
+                "price_paid": price_value,
+                "acquired_at": payload.acquired_at,
+                "notes": payload.notes,
+            }
+        ],
+    ).user_cards[card.id]
     draft.mark_validated(card.id)
 
     master_set_service = MasterSetProgressService(db)
-    master_set = master_set_service.sync_progress(current_user.id, card.set_id)
+    master_set = master_set_service.get(current_user.id, card.set_id) or master_set_service.sync_progress(
+        current_user.id, card.set_id
+    )
 
     db.commit()
+    CollectionCache().bump(current_user.id)
     db.refresh(user_card)
     db.refresh(draft)
 
+    background_tasks.add_task(report_writer.write_selections, [(str(draft.id), card.id)])
+    telemetry = get_telemetry_store()
+    if telemetry is not None:
+        background_tasks.add_task(telemetry.record_selection, str(draft.id), card.id)
+
     return CardSelectionResponse(
         draft=_draft_to_response(draft),
         user_card=UserCardResponse.model_validate(user_card),
         master_set=UserMasterSetResponse.model_validate(master_set),
     )
+
+
+@router.post("/batches/{batch_id}/select", response_model=BatchSelectionResponse)
+def select_batch_cards(
+    batch_id: UUID,
+    payload: BatchSelectionRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Valide plusieurs drafts d'un batch en une transaction : drafts et cartes
+    chargés en deux requêtes, `UserCard` ajoutées par un seul upsert (une
+    ligne par carte, quantités cumulées) et progression mise à jour par
+    delta, une requête par set concerné. Les entrées invalides sont ignorées
+    et listées dans `errors`.
+    """
+    draft_ids = [item.draft_id for item in payload.selections]
+    drafts = {
+        draft.id: draft
+        for draft in db.query(CardDraft).filter(
+            CardDraft.batch_id == batch_id,
+            CardDraft.user_id == current_user.id,
+            CardDraft.id.in_(draft_ids),
+        )
+    }
+    if not drafts:
+        raise HTTPException(status_code=404, detail="Batch introuvable")
+    cards = {
+        card.id: card
+        for card in db.query(Card).filter(Card.id.in_({item.card_id for item in payload.selections}))
+    }
+
+    errors: List[SelectionError] = []
+    rows: List[dict] = []
+    validated: List[CardDraft] = []
+    selected: List[tuple[str, str]] = []
+    seen: set = set()
+    for item in payload.selections:
+        draft = drafts.get(item.draft_id)
+        try:
+            if item.draft_id in seen:
+                raise HTTPException(status_code=400, detail="Draft présent plusieurs fois")
+            condition_value, price_value = _check_selection(draft, cards.get(item.card_id), item)
+        except HTTPException as exc:
+            errors.append(SelectionError(draft_id=item.draft_id, detail=exc.detail))
+            continue
+        seen.add(item.draft_id)
+        rows.append(
+            {
+                "user_id": current_user.id,
+                "card_id": item.card_id,
+                "draft_id": draft.id,
+                "quantity": item.quantity,
+                "condition": condition_value,
+                "price_paid": price_value,
+                "acquired_at": item.acquired_at,
+                "notes": item.notes,
+            }
+        )
+        draft.mark_validated(item.card_id)
+        validated.append(draft)
+        selected.append((str(draft.id), item.card_id))
+
+    user_cards: List[UserCard] = []
+    master_sets = []
+    if rows:
+        user_cards = list(UserCardWriter(db).upsert(current_user.id, rows).user_cards.values())
+        master_sets = MasterSetProgressService(db).get_many(
+            current_user.id, (cards[user_card.card_id].set_id for user_card in user_cards)
+        )
+
+    # Réponse construite avant le commit pour éviter un rechargement par objet.
+    db.flush()
+    response = BatchSelectionResponse(
+        batch_id=batch_id,
+        drafts=[_draft_to_response(draft) for draft in validated],
+        user_cards=[UserCardResponse.model_validate(user_card) for user_card in user_cards],
+        master_sets=[UserMasterSetResponse.model_validate(master_set) for master_set in master_sets],
+        errors=errors,
+    )
+    db.commit()
+    if rows:
+        CollectionCache().bump(current_user.id)
+
+    if selected:
+        background_tasks.add_task(report_writer.write_selections, selected)
+        telemetry = get_telemetry_store()
+        if telemetry is not None:
+            background_tasks.add_task(telemetry.record_selections, selected)
+    logger.info(
+        "✅ Batch %s : %s draft(s) validé(s), %s erreur(s)", batch_id, len(validated), len(errors)
+    )
+
+    return response
@@ -2,12 +2,16 @@
 Routes CRUD pour Sets
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import String, cast, exists, func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.database import get_db
+from app.models.card import Card
 from app.models.set import Set
-from app.schemas.set import SetCreate, SetResponse, SetUpdate
+from app.models.user_card import UserCard
+from app.schemas.set import OwnedSetCardRow, SetCardRow, SetCollectionResponse, SetCreate, SetResponse, SetUpdate
+from app.services.collection_cache import CollectionCache
 from app.utils.dependencies import get_current_user
 from app.models.user import User
 
@@ -48,6 +52,113 @@ def get_set(set_id: str, db: Session = Depends(get_db)):
     return set_obj
 
 
+def _ensure_set(db: Session, set_id: str) -> None:
+    if not db.query(exists().where(Set.id == set_id)).scalar():
+        raise HTTPException(status_code=404, detail="Set non trouvé")
+
+
+_ROW_COLUMNS = (Card.id, Card.local_id, Card.name, Card.rarity, Card.image)
+
+
+@router.get("/{set_id}/missing", response_model=List[SetCardRow])
+def get_missing_cards(
+    set_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cartes du set absentes de la collection (authentification requise)
+    Anti-jointure NOT EXISTS sur user_cards (user_id, card_id), triée par local_id
+    """
+    _ensure_set(db, set_id)
+    owned = exists().where(UserCard.user_id == current_user.id, UserCard.card_id == Card.id)
+    rows = (
+        db.query(*_ROW_COLUMNS)
+        .filter(Card.set_id == set_id, ~owned)
+        .order_by(Card.local_id, Card.id)
+        .all()
+    )
+    return [SetCardRow(**row._mapping) for row in rows]
+
+
+@router.get("/{set_id}/owned", response_model=List[OwnedSetCardRow])
+def get_owned_cards(
+    set_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cartes du set présentes dans la collection, avec la quantité cumulée
+    (authentification requise), triées par local_id
+    """
+    _ensure_set(db, set_id)
+    rows = (
+        db.query(*_ROW_COLUMNS, func.sum(UserCard.quantity).label("quantity"))
+        .join(UserCard, UserCard.card_id == Card.id)
+        .filter(Card.set_id == set_id, UserCard.user_id == current_user.id)
+        .group_by(*_ROW_COLUMNS)
+        .order_by(Card.local_id, Card.id)
+        .all()
+    )
+    return [OwnedSetCardRow(**row._mapping) for row in rows]
+
+
+_COLLECTION_COLUMNS = (
+    Card.id,
+    Card.local_id,
+    Card.name,
+    Card.rarity,
+    Card.image,
+    cast(UserCard.id, String).label("user_card_id"),
+    func.coalesce(UserCard.quantity, 0).label("quantity"),
+    UserCard.condition,
+)
+
+
+@router.get("/{set_id}/collection", response_model=SetCollectionResponse)
+def get_set_collection(
+    set_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Toutes les cartes du set avec la quantité / l'état possédés (LEFT JOIN sur
+    user_cards), en une requête ; mis en cache jusqu'à la prochaine écriture
+    dans la collection ou dans le catalogue
+    """
+    cache = CollectionCache()
+    cache_key = cache.key(
+        "set-cards", current_user.id, cache.version(current_user.id), f"c{cache.catalog_version()}", set_id
+    )
+    payload = cache.get(cache_key)
+    cached = payload is not None
+    if not cached:
+        _ensure_set(db, set_id)
+        rows = (
+            db.query(*_COLLECTION_COLUMNS)
+            .outerjoin(UserCard, (UserCard.card_id == Card.id) & (UserCard.user_id == current_user.id))
+            .filter(Card.set_id == set_id)
+            .order_by(Card.local_id, Card.id)
+            .all()
+        )
+        payload = {
+            "columns": [column.key for column in _COLLECTION_COLUMNS],
+            "cards": [list(row) for row in rows],
+        }
+        cache.set(cache_key, payload)
+
+    cards = payload["cards"]
+    quantity_index = payload["columns"].index("quantity")
+    return SetCollectionResponse(
+        set_id=set_id,
+        columns=payload["columns"],
+        cards=cards,
+        total=len(cards),
+        owned=sum(1 for card in cards if card[quantity_index]),
+        cached=cached,
+    )
+
+
 @router.post("/", response_model=SetResponse, status_code=status.HTTP_201_CREATED)
 def create_set(
     set_data: SetCreate,
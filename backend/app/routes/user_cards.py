@@ -1,20 +1,32 @@
 """
 Routes CRUD pour UserCards
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, File, HTTPException, status, Query, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from app.database import get_db
 from app.models.user_card import UserCard, CardCondition
 from app.models.card import Card
+from app.services.collection_cache import CollectionCache
+from app.services.collection_export import CollectionExporter
+from app.services.collection_import import CollectionImporter
+from app.services.collection_sync import CollectionSyncService
+from app.services.master_set import MasterSetProgressService
+from app.services.user_cards import UserCardWriter
 from app.schemas.user_card import (
+    UserCardChangesResponse,
     UserCardCreate,
     UserCardResponse,
     UserCardUpdate,
     UserCardWithCardResponse
 )
 from app.utils.dependencies import get_current_user
+from app.utils.pagination import after, decode_cursor, next_cursor
 from app.models.user import User
 
 router = APIRouter(
@@ -29,11 +41,14 @@ def get_user_cards(
     limit: int = Query(20, ge=1, le=100),
     card_id: Optional[str] = None,
     set_id: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (remplace skip)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Récupérer les cartes de l'utilisateur avec pagination
+    Offset (`skip`) ou keyset (`cursor`, sur (created_at, id)) ; le total est
+    mis en cache jusqu'à la prochaine écriture dans la collection
     """
     query = db.query(UserCard).filter(UserCard.user_id == current_user.id)
     
@@ -42,11 +57,29 @@ def get_user_cards(
     if set_id:
         query = query.join(Card).filter(Card.set_id == set_id)
     
-    # Compter le total avant pagination
-    total = query.count()
+    # Compter le total avant pagination (une fois par version de la collection)
+    cache = CollectionCache()
+    count_key = cache.key("count", current_user.id, cache.version(current_user.id), card_id or "", set_id or "")
+    total = cache.get(count_key)
+    if total is None:
+        total = query.count()
+        cache.set(count_key, total)
+    
+    # Pagination : keyset si un curseur est fourni, offset sinon
+    keyset = (UserCard.created_at, UserCard.id)
+    query = query.order_by(*keyset)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, (str, str))
+        try:
+            query = query.filter(after(keyset, (datetime.fromisoformat(created_at), UUID(last_id))))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Curseur invalide")
+    else:
+        query = query.offset(skip)
     
     # Charger les relations avec les cartes
-    user_cards = query.options(joinedload(UserCard.source_draft)).offset(skip).limit(limit).all()
+    user_cards = query.options(joinedload(UserCard.source_draft)).limit(limit + 1).all()
+    cursor_next = next_cursor(user_cards, limit, lambda uc: (uc.created_at.isoformat(), str(uc.id)))
     
     # Charger les détails des cartes
     card_ids = [uc.card_id for uc in user_cards]
@@ -91,7 +124,8 @@ def get_user_cards(
         "items": items,
         "total": total,
         "skip": skip,
-        "limit": limit
+        "limit": limit,
+        "next_cursor": cursor_next
     }
 
 
@@ -109,43 +143,10 @@ def create_user_card(
     if not card:
         raise HTTPException(status_code=404, detail="Carte non trouvée")
     
-    # Vérifier si l'utilisateur a déjà cette carte
-    existing = db.query(UserCard).filter(
-        UserCard.user_id == current_user.id,
-        UserCard.card_id == user_card.card_id
-    ).first()
-    
-    if existing:
-        # Mettre à jour la quantité si la carte existe déjà
-        existing.quantity += user_card.quantity
-        if user_card.condition:
-            existing.condition = user_card.condition
-        if user_card.price_paid is not None:
-            existing.price_paid = user_card.price_paid
-        if user_card.acquired_at:
-            existing.acquired_at = user_card.acquired_at
-        if user_card.source:
-            existing.source = user_card.source
-        if user_card.notes:
-            existing.notes = user_card.notes
-        
-        db.commit()
-        db.refresh(existing)
-        return existing
-    
-    # Créer une nouvelle entrée
-    db_user_card = UserCard(
-        user_id=current_user.id,
-        card_id=user_card.card_id,
-        quantity=user_card.quantity,
-        condition=user_card.condition,
-        price_paid=user_card.price_paid,
-        acquired_at=user_card.acquired_at,
-        source=user_card.source,
-        notes=user_card.notes
-    )
-    db.add(db_user_card)
+    # Création ou incrément de quantité si l'utilisateur possède déjà la carte
+    db_user_card = UserCardWriter(db).upsert(current_user.id, [user_card.model_dump()]).user_cards[card.id]
     db.commit()
+    CollectionCache().bump(current_user.id)
     db.refresh(db_user_card)
     
     return db_user_card
@@ -159,77 +160,95 @@ def create_user_cards_batch(
 ):
     """
     Ajouter plusieurs cartes à la collection de l'utilisateur en une seule requête
+    Une requête IN pour valider les cartes, puis un seul
+    INSERT ... ON CONFLICT (user_id, card_id) DO UPDATE, dans une transaction
     """
-    created = []
-    updated = []
-    errors = []
+    card_ids = {item.card_id for item in user_cards}
+    known_cards = {
+        card_id for (card_id,) in db.query(Card.id).filter(Card.id.in_(card_ids))
+    } if card_ids else set()
+    allowed_conditions = {c.value for c in CardCondition}
     
+    rows = []
+    errors = []
     for user_card_data in user_cards:
-        try:
-            # Vérifier que la carte existe
-            card = db.query(Card).filter(Card.id == user_card_data.card_id).first()
-            if not card:
-                errors.append({"card_id": user_card_data.card_id, "error": "Carte non trouvée"})
-                continue
-            
-            # Vérifier si l'utilisateur a déjà cette carte
-            existing = db.query(UserCard).filter(
-                UserCard.user_id == current_user.id,
-                UserCard.card_id == user_card_data.card_id
-            ).first()
-            
-            if existing:
-                # Mettre à jour la quantité
-                existing.quantity += user_card_data.quantity
-                if user_card_data.condition:
-                    existing.condition = user_card_data.condition
-                if user_card_data.price_paid is not None:
-                    existing.price_paid = user_card_data.price_paid
-                if user_card_data.acquired_at:
-                    existing.acquired_at = user_card_data.acquired_at
-                if user_card_data.source:
-                    existing.source = user_card_data.source
-                if user_card_data.notes:
-                    existing.notes = user_card_data.notes
-                
-                db.commit()
-                db.refresh(existing)
-                updated.append(existing)
-            else:
-                # Créer une nouvelle entrée
-                db_user_card = UserCard(
-                    user_id=current_user.id,
-                    card_id=user_card_data.card_id,
-                    quantity=user_card_data.quantity,
-                    condition=user_card_data.condition,
-                    price_paid=user_card_data.price_paid,
-                    acquired_at=user_card_data.acquired_at,
-                    source=user_card_data.source,
-                    notes=user_card_data.notes
-                )
-                db.add(db_user_card)
-                created.append(db_user_card)
-        except Exception as e:
-            errors.append({"card_id": user_card_data.card_id, "error": str(e)})
+        if user_card_data.card_id not in known_cards:
+            errors.append({"card_id": user_card_data.card_id, "error": "Carte non trouvée"})
+        elif user_card_data.quantity < 1:
+            errors.append({"card_id": user_card_data.card_id, "error": "Quantité invalide"})
+        elif user_card_data.condition not in allowed_conditions:
+            errors.append({"card_id": user_card_data.card_id, "error": "Condition invalide"})
+        else:
+            rows.append(user_card_data.model_dump())
     
+    result = UserCardWriter(db).upsert(current_user.id, rows)
+    # Identifiants lus avant le commit (pas de rechargement par ligne)
+    created = [str(result.user_cards[card_id].id) for card_id in result.created]
+    updated = [str(result.user_cards[card_id].id) for card_id in result.updated]
     db.commit()
-    
-    # Rafraîchir les objets créés
-    for uc in created:
-        db.refresh(uc)
+    if rows:
+        CollectionCache().bump(current_user.id)
     
     return {
         "created": len(created),
         "updated": len(updated),
         "errors": len(errors),
         "details": {
-            "created": [str(uc.id) for uc in created],
-            "updated": [str(uc.id) for uc in updated],
+            "created": created,
+            "updated": updated,
             "errors": errors
         }
     }
 
 
+@router.get("/changes", response_model=UserCardChangesResponse)
+def get_user_card_changes(
+    since: Optional[str] = Query(None, description="Jeton next_token de la synchronisation précédente"),
+    cursor: Optional[str] = Query(None, description="Curseur next_cursor de la page précédente du même delta"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Synchronisation incrémentale : cartes créées / modifiées et suppressions
+    depuis `since` (collection complète avec `reset` sans jeton ou si le jeton
+    est trop ancien), par pages à suivre avec `cursor`
+    """
+    return CollectionSyncService(db).changes(current_user.id, since, cursor)
+
+
+@router.post("/import", response_model=dict)
+def import_user_cards(
+    file: UploadFile = File(..., description="CSV avec au moins une colonne card_id"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Importer une collection depuis un CSV (lu en flux, chargé par COPY puis
+    fusionné dans user_cards par un seul upsert), dans une transaction
+    """
+    result = CollectionImporter(db).run(current_user.id, file.file)
+    db.commit()
+    if result["created"] or result["updated"]:
+        CollectionCache().bump(current_user.id)
+    return result
+
+
+@router.get("/export")
+def export_user_cards(
+    format: Literal["csv", "jsonl"] = Query("csv", description="Format d'export"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporter toute la collection (cartes et sets joints) en flux CSV ou JSON Lines
+    """
+    exporter = CollectionExporter(current_user.id)
+    filename = f"collection-{datetime.utcnow():%Y-%m-%d}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "csv":
+        return StreamingResponse(exporter.iter_csv(), media_type="text/csv; charset=utf-8", headers=headers)
+    return StreamingResponse(exporter.iter_jsonl(), media_type="application/x-ndjson", headers=headers)
+
+
 @router.get("/{user_card_id}", response_model=UserCardWithCardResponse)
 def get_user_card(
     user_card_id: str,
@@ -311,6 +330,7 @@ def update_user_card(
         db_user_card.notes = user_card_update.notes
     
     db.commit()
+    CollectionCache().bump(current_user.id)
     db.refresh(db_user_card)
     return db_user_card
 
@@ -332,7 +352,13 @@ def delete_user_card(
     if not db_user_card:
         raise HTTPException(status_code=404, detail="Carte non trouvée dans votre collection")
     
+    master_set_service = MasterSetProgressService(db)
+    CollectionSyncService(db).record_deletion(db_user_card)
     db.delete(db_user_card)
+    db.flush()
+    if not master_set_service.owned_card_ids(current_user.id, [db_user_card.card_id]):
+        master_set_service.record_changes(current_user.id, removed=[db_user_card.card_id])
     db.commit()
+    CollectionCache().bump(current_user.id)
     return None
 
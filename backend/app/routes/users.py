@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List
 
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.schemas.user import MasterSetDashboardResponse, UserCreate, UserResponse, UserUpdate
 from app.utils.security import hash_password
 from app.utils.dependencies import get_current_user
+from app.services.card_text import parse_languages
+from app.services.collection_cache import CollectionCache
+from app.services.master_set import MasterSetProgressService
 
 router = APIRouter(
     prefix="/users",
@@ -55,6 +58,32 @@ def get_users(
     return users
 
 
+@router.get("/me/master-sets", response_model=MasterSetDashboardResponse)
+def get_my_master_sets(
+    include_all: bool = Query(False, description="Inclure les sets sans aucune carte possédée"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Progression sur tous les sets de la collection (un seul agrégat SQL),
+    mise en cache par utilisateur jusqu'à la prochaine écriture dans la collection
+    """
+    cache = CollectionCache()
+    cache_key = cache.key("master-sets", current_user.id, cache.version(current_user.id), "all" if include_all else "owned")
+    items = cache.get(cache_key)
+    cached = items is not None
+    if not cached:
+        items = MasterSetProgressService(db).dashboard(current_user.id, include_all=include_all)
+        cache.set(cache_key, items)
+
+    return MasterSetDashboardResponse(
+        items=items,
+        owned_card_count=sum(item["owned_card_count"] for item in items),
+        tracked_card_count=sum(item["tracked_card_count"] for item in items),
+        cached=cached,
+    )
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: int,
@@ -97,6 +126,12 @@ def update_user(
         db_user.username = user_update.username
     if user_update.password is not None:
         db_user.hashed_password = hash_password(user_update.password)
+    if user_update.ocr_languages is not None:
+        try:
+            languages = parse_languages(user_update.ocr_languages)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        db_user.ocr_languages = ",".join(languages) if languages else None
     
     db.commit()
     db.refresh(db_user)
@@ -3,9 +3,15 @@ Scheduler pour la synchronisation périodique des données TCGdex
 """
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 import logging
 from scripts.import_tcgdex import import_series, import_sets, import_all_cards
+from app.config import get_settings
 from app.database import SessionLocal
+from app.services.collection_sync import CollectionSyncService
+from app.services.master_set import MasterSetProgressService
+from app.services.reporting import AnalysisReportWriter
+from app.services.retention import AnalysisRetentionService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,6 +42,58 @@ def sync_tcgdex_data():
         db.close()
 
 
+def sweep_analysis_data():
+    """
+    Expire les images et drafts périmés, puis purge les plus anciens par lots
+    """
+    db = SessionLocal()
+    try:
+        AnalysisRetentionService().run(db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Erreur lors du nettoyage des données d'analyse : {e}")
+    finally:
+        db.close()
+
+
+def reconcile_master_sets():
+    """
+    Recalcule en masse les compteurs de master sets pour corriger toute dérive
+    """
+    db = SessionLocal()
+    try:
+        MasterSetProgressService(db).reconcile_all()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Erreur lors de la réconciliation des master sets : {e}")
+    finally:
+        db.close()
+
+
+def prune_collection_tombstones():
+    """
+    Purge les tombstones de synchronisation au-delà de la rétention
+    """
+    db = SessionLocal()
+    try:
+        CollectionSyncService(db).prune()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Erreur lors de la purge des tombstones : {e}")
+    finally:
+        db.close()
+
+
+def prune_analysis_reports():
+    """
+    Applique la rétention (âge / taille) des rapports d'analyse
+    """
+    try:
+        AnalysisReportWriter().prune()
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de la rotation des rapports : {e}")
+
+
 def start_scheduler():
     """
     Démarre le scheduler de synchronisation
@@ -52,6 +110,39 @@ def start_scheduler():
         replace_existing=True
     )
     
+    settings = get_settings()
+    scheduler.add_job(
+        sweep_analysis_data,
+        trigger=IntervalTrigger(minutes=settings.image_sweep_interval_minutes),
+        id="sweep_analysis_data",
+        name="Expiration des images et drafts d'analyse",
+        replace_existing=True
+    )
+
+    scheduler.add_job(
+        reconcile_master_sets,
+        trigger=CronTrigger(hour=3, minute=30),
+        id="reconcile_master_sets",
+        name="Réconciliation des master sets",
+        replace_existing=True
+    )
+
+    scheduler.add_job(
+        prune_collection_tombstones,
+        trigger=CronTrigger(hour=3, minute=45),
+        id="prune_collection_tombstones",
+        name="Purge des tombstones de collection",
+        replace_existing=True
+    )
+
+    scheduler.add_job(
+        prune_analysis_reports,
+        trigger=CronTrigger(hour=4, minute=0),
+        id="prune_analysis_reports",
+        name="Rotation des rapports d'analyse",
+        replace_existing=True
+    )
+
     scheduler.start()
     logger.info("⏰ Scheduler démarré - Synchronisation quotidienne à 3h00")
     
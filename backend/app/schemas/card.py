@@ -54,6 +54,7 @@ class CardResponse(CardBase):
 class CardsListResponse(BaseModel):
     """Schéma de réponse pour la liste paginée de cartes"""
     items: List[CardResponse]
-    total: int
+    total: Optional[int] = None
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -29,6 +29,11 @@ class DetectedMetadata(BaseModel):
     illustrator_hint: Optional[str] = None
     release_year: Optional[str] = None
     raw_lines: Optional[List[str]] = None
+    quality: Optional[dict] = None
+    quad: Optional[List[List[int]]] = None
+    ocr_skipped: Optional[bool] = None
+    deferred: Optional[bool] = None
+    deferred_reason: Optional[str] = None
 
 
 class CardDraftResponse(BaseModel):
@@ -36,6 +41,8 @@ class CardDraftResponse(BaseModel):
     batch_id: UUID
     image_id: UUID
     image_url: str
+    preview_url: Optional[str] = None
+    crop_url: Optional[str] = None
     status: str
     subject_type: str
     candidates: List[CardCandidate]
@@ -52,6 +59,7 @@ class ImageBatchResponse(BaseModel):
     batch_id: UUID
     drafts: List[CardDraftResponse]
     report_path: Optional[str] = None
+    auto_accepted: int = 0
 
 
 class CardSelectionRequest(BaseModel):
@@ -95,3 +103,24 @@ class CardSelectionResponse(BaseModel):
     draft: CardDraftResponse
     user_card: UserCardResponse
     master_set: Optional[UserMasterSetResponse] = None
+
+
+class BatchSelectionItem(CardSelectionRequest):
+    draft_id: UUID
+
+
+class BatchSelectionRequest(BaseModel):
+    selections: List[BatchSelectionItem] = Field(..., min_length=1, max_length=500)
+
+
+class SelectionError(BaseModel):
+    draft_id: UUID
+    detail: str
+
+
+class BatchSelectionResponse(BaseModel):
+    batch_id: UUID
+    drafts: List[CardDraftResponse]
+    user_cards: List[UserCardResponse]
+    master_sets: List[UserMasterSetResponse]
+    errors: List[SelectionError] = Field(default_factory=list)
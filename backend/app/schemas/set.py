@@ -3,7 +3,7 @@ Schémas Pydantic pour Set
 """
 from pydantic import BaseModel
 from datetime import datetime, date
-from typing import Optional
+from typing import Any, List, Optional
 
 
 class SetBase(BaseModel):
@@ -41,3 +41,30 @@ class SetResponse(SetBase):
 
     class Config:
         from_attributes = True
+
+
+class SetCardRow(BaseModel):
+    """Ligne compacte d'une carte d'un set"""
+    id: str
+    local_id: str
+    name: str
+    rarity: Optional[str] = None
+    image: Optional[str] = None
+
+
+class OwnedSetCardRow(SetCardRow):
+    """Ligne compacte d'une carte possédée (quantité cumulée)"""
+    quantity: int
+
+
+class SetCollectionResponse(BaseModel):
+    """
+    Toutes les cartes d'un set fusionnées avec la collection, en tableau
+    compact : une liste de valeurs par carte, dans l'ordre de `columns`
+    """
+    set_id: str
+    columns: List[str]
+    cards: List[List[Any]]
+    total: int
+    owned: int
+    cached: bool = False
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 
 class UserBase(BaseModel):
@@ -20,6 +20,7 @@ class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     username: Optional[str] = None
     password: Optional[str] = None
+    ocr_languages: Optional[str] = None
 
 
 class UserResponse(UserBase):
@@ -27,8 +28,30 @@ class UserResponse(UserBase):
     Schéma de réponse
     """
     id: int
+    ocr_languages: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+
+class MasterSetProgress(BaseModel):
+    """
+    Progression sur un set (tableau de bord collection)
+    """
+    set_id: str
+    set_name: str
+    series_id: Optional[str] = None
+    logo: Optional[str] = None
+    release_date: Optional[date] = None
+    tracked_card_count: int
+    owned_card_count: int
+    completion_rate: float
+
+
+class MasterSetDashboardResponse(BaseModel):
+    items: List[MasterSetProgress]
+    owned_card_count: int
+    tracked_card_count: int
+    cached: bool = False
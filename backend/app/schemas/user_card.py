@@ -3,7 +3,8 @@ Schémas Pydantic pour UserCard
 """
 from pydantic import BaseModel
 from datetime import datetime, date
-from typing import Optional
+from typing import List, Optional
+from uuid import UUID
 from app.models.user_card import CardCondition
 
 
@@ -51,3 +52,44 @@ class UserCardWithCardResponse(UserCardResponse):
     class Config:
         from_attributes = True
 
+
+
+class UserCardChange(BaseModel):
+    """Ligne créée ou modifiée depuis le jeton de synchronisation"""
+    id: UUID
+    card_id: str
+    quantity: int
+    condition: str
+    price_paid: Optional[float] = None
+    acquired_at: Optional[date] = None
+    source: Optional[str] = None
+    notes: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class UserCardDeletion(BaseModel):
+    """Suppression (tombstone) depuis le jeton de synchronisation"""
+    id: UUID
+    card_id: str
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class UserCardChangesResponse(BaseModel):
+    """
+    Delta de la collection, par pages : `reset` (première page) indique une
+    liste complète (premier appel ou jeton trop ancien) qui remplace la copie
+    locale ; `next_cursor` donne la page suivante, `next_token` sert au
+    prochain delta une fois la dernière page lue
+    """
+    items: List[UserCardChange]
+    deleted: List[UserCardDeletion]
+    next_token: str
+    next_cursor: Optional[str] = None
+    reset: bool = False
@@ -38,6 +38,8 @@ class CardMatchingService:
         self.db = db
         self.settings = get_settings()
         self.visual_matcher = visual_matcher
+        # Nombre de cartes évaluées lors du dernier appel (télémétrie).
+        self.last_scored_count = 0
 
     def _normalize(self, value: Optional[str]) -> str:
         if not value:
@@ -71,6 +73,7 @@ class CardMatchingService:
         if not cards:
             cards = self.db.query(Card).options(joinedload(Card.set)).limit(400).all()
 
+        self.last_scored_count = len(cards)
         norm_name = self._normalize(probable_name)
 
         scored: List[CardCandidate] = []
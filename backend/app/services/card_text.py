@@ -6,11 +6,14 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 
 from app.config import get_settings
+from app.services.ocr_cache import OcrResultCache
 
 logger = logging.getLogger("app.analysis.card_text")
 
@@ -30,6 +33,52 @@ except Exception:  # pragma: no cover
     pytesseract = None  # type: ignore
 
 
+_readers: "OrderedDict[Tuple[str, ...], object]" = OrderedDict()
+_readers_lock = Lock()
+
+
+def parse_languages(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Convertit un indice de langues ("fr" / "fr,en") en liste validée.
+    Lève ValueError si une langue n'est pas proposée par le backend.
+    """
+    if not value:
+        return None
+    languages = list(dict.fromkeys(lang.strip().lower() for lang in value.split(",") if lang.strip()))
+    if not languages:
+        return None
+    supported = get_settings().analysis_supported_languages
+    unsupported = [lang for lang in languages if lang not in supported]
+    if unsupported:
+        raise ValueError(f"Langue(s) OCR non supportée(s) : {', '.join(unsupported)}")
+    return languages
+
+
+def get_ocr_reader(languages: Tuple[str, ...]):
+    """
+    Retourne un lecteur EasyOCR partagé pour un jeu de langues donné.
+    Seuls les `ocr_max_resident_readers` jeux les plus récents restent en mémoire.
+    """
+    if easyocr is None:
+        return None
+    key = tuple(sorted(languages))
+    with _readers_lock:
+        if key in _readers:
+            _readers.move_to_end(key)
+            return _readers[key]
+        try:
+            reader = easyocr.Reader(list(languages), gpu=False, verbose=False)
+            logger.info("🧠 EasyOCR initialisé pour les langues %s", list(languages))
+        except Exception as exc:  # pragma: no cover
+            logger.warning("Impossible d'initialiser EasyOCR (%s), fallback pytesseract", exc)
+            return None
+        _readers[key] = reader
+        while len(_readers) > get_settings().ocr_max_resident_readers:
+            evicted, _ = _readers.popitem(last=False)
+            logger.info("♻️  Lecteur EasyOCR %s déchargé", list(evicted))
+        return reader
+
+
 @dataclass
 class TextExtractionResult:
     raw_lines: List[str]
@@ -42,6 +91,10 @@ class TextExtractionResult:
     attacks: List[str]
     release_year: Optional[str]
 
+    @classmethod
+    def empty(cls) -> "TextExtractionResult":
+        return cls([], None, None, None, None, None, [], [], None)
+
 
 class CardTextExtractor:
     """
@@ -52,20 +105,21 @@ class CardTextExtractor:
     def __init__(self) -> None:
         settings = get_settings()
         self.languages = settings.analysis_languages
-        self.reader = None
-        if easyocr is not None:
-            try:
-                self.reader = easyocr.Reader(self.languages, gpu=False, verbose=False)
-                logger.info("🧠 EasyOCR initialisé pour les langues %s", self.languages)
-            except Exception as exc:  # pragma: no cover
-                logger.warning("Impossible d'initialiser EasyOCR (%s), fallback pytesseract", exc)
-                self.reader = None
-        if self.reader is None and pytesseract is None:
+        self.cache = OcrResultCache()
+        # Le lecteur EasyOCR est résolu à la première lecture (`_read_text`),
+        # pour les seules langues réellement demandées.
+        if easyocr is None and pytesseract is None:
             logger.warning("Aucun moteur OCR disponible, les extractions seront vides")
 
-    def extract(self, image: "np.ndarray") -> TextExtractionResult:
+    def extract(
+        self,
+        image: "np.ndarray",
+        languages: Optional[Sequence[str]] = None,
+    ) -> TextExtractionResult:
         if cv2 is None:
-            return TextExtractionResult([], None, None, None, None, None, [], [], None)
+            return TextExtractionResult.empty()
+
+        active_languages = tuple(languages or self.languages)
 
         h, w = image.shape[:2]
         segments = {
@@ -80,7 +134,7 @@ class CardTextExtractor:
             if crop.size == 0:
                 lines[key] = []
                 continue
-            texts = self._read_text(crop)
+            texts = self._read_text_cached(key, crop, active_languages)
             cleaned = [self._clean_text(t) for t in texts if t.strip()]
             lines[key] = cleaned
             logger.debug("OCR %s -> %s", key, cleaned[:3])
@@ -119,6 +173,8 @@ class CardTextExtractor:
         if crop.size == 0 or cv2 is None:
             return crop
         resized = crop
+        # Les crops redressés (630x880 par défaut) dépassent toujours ce seuil ;
+        # l'agrandissement ne concerne que les crops bruts (redressement désactivé).
         if min(crop.shape[:2]) < 120:
             scale = 120 / min(crop.shape[:2])
             resized = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
@@ -127,18 +183,35 @@ class CardTextExtractor:
         normalized = cv2.normalize(blur, None, 0, 255, cv2.NORM_MINMAX)
         return normalized
 
-    def _read_text(self, image: "np.ndarray") -> List[str]:
-        if self.reader is not None:
+    def _read_text_cached(self, segment: str, image: "np.ndarray", languages: Tuple[str, ...]) -> List[str]:
+        cache_handle, cached = self.cache.get(segment, image, languages)
+        if cached is not None:
+            logger.debug("OCR %s servi depuis le cache", segment)
+            return cached
+        texts, cacheable = self._read_text(image, languages)
+        if cacheable:
+            self.cache.set(cache_handle, texts)
+        return texts
+
+    def _read_text(self, image: "np.ndarray", languages: Tuple[str, ...]) -> Tuple[List[str], bool]:
+        """
+        Retourne (lignes, cacheable) : un résultat obtenu sans moteur OCR ou
+        après une erreur EasyOCR n'est pas mis en cache.
+        """
+        reader = get_ocr_reader(languages)
+        cacheable = reader is not None
+        if reader is not None:
             try:
-                results = self.reader.readtext(image, detail=0, paragraph=True)
-                return [res for res in results if isinstance(res, str)]
+                results = reader.readtext(image, detail=0, paragraph=True)
+                return [res for res in results if isinstance(res, str)], True
             except Exception as exc:  # pragma: no cover
                 logger.warning("EasyOCR erreur (%s), fallback pytesseract", exc)
+                cacheable = False
 
         if pytesseract is None:
-            return []
-        text = pytesseract.image_to_string(image, lang="+".join(self.languages), config="--psm 6")
-        return text.splitlines()
+            return [], False
+        text = pytesseract.image_to_string(image, lang="+".join(languages), config="--psm 6")
+        return text.splitlines(), cacheable
 
     def _clean_text(self, text: str) -> str:
         text = text.replace("’", "'").replace("`", "'")
@@ -0,0 +1,102 @@
+"""
+Cache Redis des vues dérivées de la collection d'un utilisateur.
+
+Chaque utilisateur a un numéro de version (`collection:version:<user_id>`)
+incrémenté à chaque écriture dans `user_cards` ; les entrées en cache
+incluent ce numéro dans leur clé, l'invalidation est donc un simple INCR.
+Les vues qui embarquent aussi le catalogue (cartes d'un set) incluent en plus
+la version globale `collection:catalog:version`, incrémentée par l'import
+TCGdex et les routes d'écriture des cartes.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Optional
+
+from app.config import get_settings
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger("app.collection_cache")
+
+try:
+    from redis.exceptions import RedisError  # type: ignore
+except Exception:  # pragma: no cover
+    RedisError = Exception  # type: ignore
+
+
+class CollectionCache:
+    def __init__(self) -> None:
+        settings = get_settings()
+        self._ttl = settings.collection_cache_ttl_seconds
+        self._enabled = self._ttl > 0
+        self._client = get_redis_client() if self._enabled else None
+        self._prefix = "collection"
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{self._prefix}:version:{user_id}"
+
+    def _read_version(self, key: str) -> int:
+        if not self._enabled:
+            return 0
+        try:
+            value = self._client.get(key)  # type: ignore[union-attr]
+        except RedisError as exc:
+            logger.debug("Version de collection indisponible (%s)", exc)
+            return 0
+        return int(value) if value else 0
+
+    def version(self, user_id: int) -> int:
+        return self._read_version(self._version_key(user_id))
+
+    def catalog_version(self) -> int:
+        return self._read_version(f"{self._prefix}:catalog:version")
+
+    def bump(self, user_id: int) -> None:
+        """
+        Invalide toutes les vues en cache de la collection de `user_id`.
+        """
+        if not self._enabled:
+            return
+        try:
+            self._client.incr(self._version_key(user_id))  # type: ignore[union-attr]
+        except RedisError as exc:
+            logger.warning("Invalidation du cache collection %s impossible (%s)", user_id, exc)
+
+    def bump_catalog(self) -> None:
+        """
+        Invalide, pour tous les utilisateurs, les vues qui dépendent du catalogue.
+        """
+        if not self._enabled:
+            return
+        try:
+            self._client.incr(f"{self._prefix}:catalog:version")  # type: ignore[union-attr]
+        except RedisError as exc:
+            logger.warning("Invalidation du cache catalogue impossible (%s)", exc)
+
+    def key(self, name: str, user_id: int, version: int, *parts: object) -> str:
+        suffix = ":".join(str(part) for part in parts)
+        key = f"{self._prefix}:{name}:{user_id}:v{version}"
+        return f"{key}:{suffix}" if suffix else key
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self._enabled:
+            return None
+        try:
+            cached = self._client.get(key)  # type: ignore[union-attr]
+        except RedisError:
+            return None
+        if cached is None:
+            return None
+        try:
+            return json.loads(cached)
+        except ValueError:
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        if not self._enabled:
+            return
+        try:
+            self._client.setex(key, self._ttl, json.dumps(value, separators=(",", ":"), default=str))  # type: ignore[union-attr]
+        except RedisError as exc:
+            logger.debug("Écriture cache collection impossible (%s)", exc)
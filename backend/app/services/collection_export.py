@@ -0,0 +1,81 @@
+"""
+Export de la collection en flux (CSV ou JSON Lines) : curseur serveur
+(`yield_per`) et écriture par paquets, mémoire constante quelle que soit
+la taille de la collection.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.card import Card
+from app.models.set import Set
+from app.models.user_card import UserCard
+from app.services.reporting import dumps_compact
+
+EXPORT_COLUMNS = (
+    UserCard.id.label("user_card_id"),
+    UserCard.card_id,
+    Card.name.label("card_name"),
+    Card.local_id,
+    Card.rarity,
+    Card.set_id,
+    Set.name.label("set_name"),
+    Set.series_id,
+    UserCard.quantity,
+    UserCard.condition,
+    UserCard.price_paid,
+    UserCard.acquired_at,
+    UserCard.source,
+    UserCard.notes,
+    UserCard.created_at,
+    UserCard.updated_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+class CollectionExporter:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.batch_size = get_settings().collection_export_batch_size
+
+    def _partitions(self) -> Iterator[list]:
+        """
+        Lignes de la collection par paquets de `batch_size`, lues dans une
+        session dédiée : le flux survit à la session de la requête.
+        """
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .join(Card, Card.id == UserCard.card_id)
+            .join(Set, Set.id == Card.set_id)
+            .where(UserCard.user_id == self.user_id)
+            .order_by(Card.set_id, Card.local_id, Card.id)
+            .execution_options(yield_per=self.batch_size)
+        )
+        db = SessionLocal()
+        try:
+            for partition in db.execute(stmt).partitions():
+                yield partition
+        finally:
+            db.close()
+
+    def iter_csv(self) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        for partition in self._partitions():
+            writer.writerows(partition)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    def iter_jsonl(self) -> Iterator[bytes]:
+        for partition in self._partitions():
+            yield b"".join(dumps_compact(dict(row._mapping)) + b"\n" for row in partition)
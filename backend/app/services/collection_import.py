@@ -0,0 +1,169 @@
+"""
+Import de collection depuis un CSV : lecture en flux, chargement par
+`COPY` dans une table temporaire, puis un seul upsert ensembliste vers
+`user_cards` et un seul recomptage des master sets touchés.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import tempfile
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, BinaryIO, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy import Column, Date, Integer, MetaData, Numeric, String, Table, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg, insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.card import Card
+from app.models.user_card import CardCondition, UserCard
+from app.services.master_set import MasterSetProgressService
+from app.services.user_cards import INSERTED, on_conflict_increment
+
+logger = logging.getLogger("app.collection_import")
+
+_STAGING = Table(
+    "user_cards_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("card_id", String, nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("condition", String, nullable=False),
+    Column("price_paid", Numeric(10, 2)),
+    Column("acquired_at", Date),
+    Column("source", String),
+    Column("notes", String),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+_FIELDS = [column.name for column in _STAGING.columns]
+_MAX_REPORTED_ERRORS = 100
+
+
+class CollectionImporter:
+    """
+    Colonnes reconnues : `card_id` (obligatoire), `quantity`, `condition`,
+    `price_paid`, `acquired_at` (AAAA-MM-JJ), `source`, `notes` ; les autres
+    sont ignorées, un export `GET /user-cards/export?format=csv` se réimporte
+    donc tel quel.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.max_rows = get_settings().collection_import_max_rows
+        self._conditions = {c.value for c in CardCondition}
+        self.errors: List[Dict[str, Any]] = []
+        self.error_count = 0
+
+    def _error(self, line: int, card_id: str, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < _MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "card_id": card_id, "error": message})
+
+    def _parse(self, line: int, row: Dict[str, str]) -> List[Any] | None:
+        card_id = (row.get("card_id") or "").strip()
+        if not card_id:
+            self._error(line, card_id, "card_id manquant")
+            return None
+        try:
+            quantity = int(row.get("quantity") or 1)
+            price = Decimal(row["price_paid"]) if row.get("price_paid") else None
+            acquired_at = date.fromisoformat(row["acquired_at"][:10]) if row.get("acquired_at") else None
+        except (ValueError, InvalidOperation):
+            self._error(line, card_id, "Valeur invalide")
+            return None
+        condition = (row.get("condition") or CardCondition.near_mint.value).strip()
+        if quantity < 1:
+            self._error(line, card_id, "Quantité invalide")
+            return None
+        if condition not in self._conditions:
+            self._error(line, card_id, "Condition invalide")
+            return None
+        return [line, card_id, quantity, condition, price, acquired_at, row.get("source") or None, row.get("notes") or None]
+
+    def _stage(self, upload: BinaryIO) -> int:
+        """
+        Normalise le CSV ligne à ligne dans un fichier temporaire (mémoire
+        bornée), puis le charge par COPY dans la table temporaire.
+        """
+        reader = csv.DictReader(io.TextIOWrapper(upload, encoding="utf-8-sig", newline=""))
+        if not reader.fieldnames or "card_id" not in reader.fieldnames:
+            raise HTTPException(status_code=400, detail="Colonne card_id manquante")
+
+        staged = 0
+        with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode="w+", newline="") as buffer:
+            writer = csv.writer(buffer)
+            for count, row in enumerate(reader, start=1):
+                if count > self.max_rows:
+                    raise HTTPException(status_code=400, detail=f"Fichier limité à {self.max_rows} lignes")
+                values = self._parse(reader.line_num, row)
+                if values is not None:
+                    writer.writerow(values)
+                    staged += 1
+            buffer.seek(0)
+
+            connection = self.db.connection()
+            _STAGING.create(connection, checkfirst=False)
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {_STAGING.name} ({', '.join(_FIELDS)}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            finally:
+                cursor.close()
+        return staged
+
+    def run(self, user_id: int, upload: BinaryIO) -> Dict[str, Any]:
+        staged = self._stage(upload)
+        s = _STAGING.c
+
+        known = exists().where(Card.id == s.card_id)
+        for line, card_id in self.db.execute(select(s.line, s.card_id).where(~known).order_by(s.line)):
+            self._error(line, card_id, "Carte non trouvée")
+
+        def last(column):
+            # Dernière valeur non nulle du fichier pour une même carte.
+            return array_agg(aggregate_order_by(column, column.is_(None), s.line.desc()))[1]
+
+        merged = (
+            select(
+                func.gen_random_uuid(),
+                literal(user_id),
+                s.card_id,
+                func.sum(s.quantity),
+                last(s.condition),
+                last(s.price_paid),
+                last(s.acquired_at),
+                last(s.source),
+                last(s.notes),
+            )
+            .where(known)
+            .group_by(s.card_id)
+        )
+        stmt = on_conflict_increment(
+            insert(UserCard).from_select(
+                ["id", "user_id", "card_id", "quantity", "condition", "price_paid", "acquired_at", "source", "notes"],
+                merged,
+            )
+        )
+        results = self.db.execute(stmt.returning(UserCard.card_id, INSERTED)).all()
+        created = sum(1 for _, inserted in results if inserted)
+
+        if created:
+            touched_sets = select(Card.set_id).join(_STAGING, s.card_id == Card.id).distinct()
+            MasterSetProgressService(self.db).sync_progress_many(user_id, self.db.scalars(touched_sets).all())
+
+        logger.info(
+            "📥 Import CSV utilisateur %s : %s ligne(s), %s carte(s) créée(s), %s mise(s) à jour, %s erreur(s)",
+            user_id, staged, created, len(results) - created, self.error_count,
+        )
+        return {
+            "created": created,
+            "updated": len(results) - created,
+            "errors": self.error_count,
+            "details": {"errors": self.errors},
+        }
@@ -0,0 +1,118 @@
+"""
+Synchronisation incrémentale de la collection : lignes créées / modifiées
+(index `user_cards (user_id, change_xid, id)`) et tombstones des
+suppressions depuis un jeton opaque.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.user_card import UserCard
+from app.models.user_card_tombstone import UserCardTombstone
+from app.utils.pagination import after, decode_cursor, encode_cursor, next_cursor
+
+logger = logging.getLogger("app.collection_sync")
+
+# Plus petit identifiant de transaction encore en cours : toute transaction
+# antérieure est terminée (validée ou annulée).
+_SNAPSHOT_XMIN = literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+class CollectionSyncService:
+    """
+    Le jeton encode le `pg_snapshot_xmin` de la lecture qui l'a émis. Chaque
+    ligne et tombstone porte `change_xid`, l'identifiant de la transaction
+    qui l'a écrite : le delta suivant relit tout `change_xid >= xmin`. Une
+    écriture validée après l'émission du jeton a forcément un identifiant
+    supérieur, quelle que soit la durée de sa transaction ; elle peut être
+    servie deux fois (le client applique des remplacements idempotents par id).
+
+    Les lignes sont servies par pages de COLLECTION_SYNC_PAGE_SIZE (keyset sur
+    (change_xid, id), `next_cursor`) ; toutes les pages d'un même delta
+    renvoient le même `next_token`, à utiliser une fois la dernière lue.
+    """
+
+    def __init__(self, db: Session):
+        settings = get_settings()
+        self.db = db
+        self.page_size = settings.collection_sync_page_size
+        self.retention_days = settings.collection_tombstone_retention_days
+
+    def record_deletion(self, user_card: UserCard) -> None:
+        self.db.add(UserCardTombstone(id=user_card.id, user_id=user_card.user_id, card_id=user_card.card_id))
+
+    def _since(self, token: str) -> Tuple[int, datetime]:
+        watermark, issued_at = decode_cursor(token, (int, str))
+        try:
+            issued = datetime.fromisoformat(issued_at)
+        except ValueError:
+            issued = None
+        if issued is None or issued.tzinfo is None:
+            raise HTTPException(status_code=400, detail="Jeton de synchronisation invalide")
+        return watermark, issued
+
+    def changes(self, user_id: int, token: Optional[str] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+        keyset = (UserCard.change_xid, UserCard.id)
+        items = select(UserCard).where(UserCard.user_id == user_id)
+        deleted = []
+
+        if cursor:
+            # Page suivante d'un delta en cours : bornes figées à la première page.
+            since, watermark, issued_at, last_xid, last_id = decode_cursor(cursor, (int, int, str, int, str))
+            try:
+                issued = datetime.fromisoformat(issued_at)
+                items = items.where(after(keyset, (last_xid, UUID(last_id))))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Curseur invalide")
+            reset = False
+        else:
+            issued, watermark = self.db.execute(select(func.now(), _SNAPSHOT_XMIN)).one()
+            since, since_issued = self._since(token) if token else (0, None)
+            reset = since_issued is None or (
+                self.retention_days > 0 and since_issued < issued - timedelta(days=self.retention_days)
+            )
+            if reset:
+                since = 0
+            else:
+                deleted = self.db.scalars(
+                    select(UserCardTombstone)
+                    .where(UserCardTombstone.user_id == user_id, UserCardTombstone.change_xid >= since)
+                    .order_by(UserCardTombstone.change_xid)
+                ).all()
+
+        if since:
+            items = items.where(UserCard.change_xid >= since)
+        rows = self.db.scalars(items.order_by(*keyset).limit(self.page_size + 1)).all()
+        return {
+            "items": rows,
+            "deleted": deleted,
+            "next_token": encode_cursor([watermark, issued.isoformat()]),
+            "next_cursor": next_cursor(
+                rows,
+                self.page_size,
+                lambda uc: (since, watermark, issued.isoformat(), uc.change_xid, str(uc.id)),
+            ),
+            "reset": reset,
+        }
+
+    def prune(self) -> int:
+        """
+        Supprime les tombstones plus anciens que COLLECTION_TOMBSTONE_RETENTION_DAYS
+        (les jetons antérieurs déclenchent alors une resynchronisation complète).
+        """
+        if self.retention_days <= 0:
+            return 0
+        cutoff = func.now() - timedelta(days=self.retention_days)
+        result = self.db.execute(delete(UserCardTombstone).where(UserCardTombstone.deleted_at < cutoff))
+        self.db.commit()
+        if result.rowcount:
+            logger.info("🧹 %s tombstone(s) de collection supprimé(s)", result.rowcount)
+        return result.rowcount
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import io
 import logging
+import time
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Sequence, Tuple
 
@@ -21,7 +22,9 @@ except Exception:  # pragma: no cover - OpenCV optionnel en local
 
 logger = logging.getLogger("app.analysis.image")
 
-from app.services.card_text import CardTextExtractor
+from app.config import get_settings
+from app.services.card_text import CardTextExtractor, TextExtractionResult
+from app.services.image_codec import stored_format
 
 
 @dataclass
@@ -39,7 +42,21 @@ class DetectedCardFeatures:
     confidence: float = 0.0
     release_year: Optional[str] = None
     raw_lines: Optional[List[str]] = None
+    quality: Optional[Dict[str, object]] = None
+    quad: Optional[List[List[int]]] = None
+    ocr_skipped: bool = False
+    deferred: bool = False
+    deferred_reason: Optional[str] = None
     image_patch: Optional["np.ndarray"] = field(default=None, repr=False, compare=False)
+    thumbnail: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    @property
+    def analyzed(self) -> bool:
+        """
+        Zone passée par l'OCR (ou écartée pour mauvaise qualité) : ses
+        résultats d'extraction sont disponibles.
+        """
+        return self.raw_lines is not None
 
     def to_payload(self) -> dict:
         return {
@@ -56,6 +73,11 @@ class DetectedCardFeatures:
             "confidence": self.confidence,
             "release_year": self.release_year,
             "raw_lines": self.raw_lines,
+            "quality": self.quality,
+            "quad": self.quad,
+            "ocr_skipped": self.ocr_skipped,
+            "deferred": self.deferred,
+            "deferred_reason": self.deferred_reason,
         }
 
 
@@ -68,9 +90,22 @@ class ImageAnalyzer:
         self.min_area_ratio = 0.01
         self.max_area_ratio = 0.95
         self.logger = logger
+        self.settings = get_settings()
         self.text_extractor = CardTextExtractor()
 
-    def analyze(self, image_bytes: bytes, subject_type: str = "cards") -> List[DetectedCardFeatures]:
+    def analyze(
+        self,
+        image_bytes: bytes,
+        subject_type: str = "cards",
+        languages: Optional[Sequence[str]] = None,
+        deadline: Optional[float] = None,
+        max_cards: Optional[int] = None,
+    ) -> List[DetectedCardFeatures]:
+        """
+        Analyse les zones par confiance décroissante. Une fois `deadline`
+        (horloge `time.monotonic`) dépassée ou `max_cards` zones analysées,
+        les zones restantes sont retournées sans OCR avec `deferred=True`.
+        """
         if subject_type != "cards":
             self.logger.info("⏭️  Analyse ignorée pour le type %s", subject_type)
             return []
@@ -91,45 +126,244 @@ class ImageAnalyzer:
             ]
 
         boxes = self._collect_candidate_boxes(image) or [{"box": fallback_box, "confidence": 0.1, "orientation": "fallback"}]
+        boxes = sorted(boxes, key=lambda b: b.get("confidence", 0.0), reverse=True)
         self.logger.info("🃏 %s zone(s) candidate(s) détectées", len(boxes))
 
         detections: List[DetectedCardFeatures] = []
+        analyzed = 0
         for idx, candidate in enumerate(boxes, start=1):
-            x, y, w, h = candidate["box"]
-            crop = image[y : y + h, x : x + w]
-            extraction = self.text_extractor.extract(crop)
-            raw_text = "\n".join(extraction.raw_lines) if extraction.raw_lines else ""
-            detections.append(
-                DetectedCardFeatures(
-                    bounding_box=(int(x), int(y), int(w), int(h)),
-                    raw_text=raw_text,
-                    probable_name=extraction.probable_name,
-                    local_number=extraction.card_number,
-                    set_hint=extraction.set_hint,
-                    hp_hint=extraction.hp_hint,
-                    type_hint=extraction.types,
-                    attacks=extraction.attacks,
-                    illustrator_hint=extraction.illustrator,
-                    release_year=extraction.release_year,
-                    raw_lines=extraction.raw_lines,
-                    orientation=candidate.get("orientation", "original"),
-                    confidence=candidate.get("confidence", 0.0),
-                    image_patch=crop,
+            deferred_reason = None
+            if max_cards is not None and analyzed >= max_cards:
+                deferred_reason = "max_cards"
+            elif deadline is not None and time.monotonic() >= deadline:
+                deferred_reason = "time_budget"
+
+            if deferred_reason:
+                x, y, w, h = candidate["box"]
+                detections.append(
+                    DetectedCardFeatures(
+                        bounding_box=(int(x), int(y), int(w), int(h)),
+                        raw_text="",
+                        probable_name=None,
+                        local_number=None,
+                        set_hint=None,
+                        orientation=candidate.get("orientation", "original"),
+                        confidence=candidate.get("confidence", 0.0),
+                        deferred=True,
+                        deferred_reason=deferred_reason,
+                        thumbnail=self._encode_thumbnail(image[y : y + h, x : x + w]),
+                    )
                 )
-            )
-            self.logger.debug(
-                "  ↳ zone #%s (%s) %sx%s - nom:%s num:%s set:%s conf:%.2f",
+                continue
+
+            detections.append(self._analyze_box(image, candidate, idx, languages))
+            analyzed += 1
+
+        deferred_count = len(detections) - analyzed
+        if deferred_count:
+            self.logger.info("⏳ %s zone(s) différée(s)", deferred_count)
+        return detections
+
+    def analyze_region(
+        self,
+        image_bytes: bytes,
+        bounding_box: Sequence[int],
+        orientation: str = "original",
+        confidence: float = 0.0,
+        languages: Optional[Sequence[str]] = None,
+    ) -> Optional[DetectedCardFeatures]:
+        """
+        Analyse à la demande une zone précédemment différée.
+        """
+        image, _ = self._load_image(image_bytes)
+        if image is None or cv2 is None or np is None:
+            return None
+        x, y, w, h = (int(v) for v in bounding_box)
+        candidate = {"box": (x, y, w, h), "orientation": orientation, "confidence": confidence}
+        return self._analyze_box(image, candidate, 1, languages)
+
+    def _analyze_box(
+        self,
+        image: "np.ndarray",
+        candidate: Dict[str, object],
+        idx: int,
+        languages: Optional[Sequence[str]],
+    ) -> DetectedCardFeatures:
+        x, y, w, h = candidate["box"]
+        crop, quad = self._rectify_crop(image, (x, y, w, h))
+        quality = self._assess_quality(crop)
+        skip_ocr = bool(quality["low_quality"]) and self.settings.analysis_skip_low_quality
+        if skip_ocr:
+            self.logger.info(
+                "  🌫️  zone #%s ignorée (netteté=%.1f, reflets=%.2f)",
                 idx,
-                candidate.get("orientation"),
-                w,
-                h,
-                extraction.probable_name,
-                extraction.card_number,
-                extraction.set_hint,
-                candidate.get("confidence", 0.0),
+                quality["sharpness"],
+                quality["glare_ratio"],
             )
+            extraction = TextExtractionResult.empty()
+        else:
+            extraction = self.text_extractor.extract(crop, languages=languages)
+        raw_text = "\n".join(extraction.raw_lines) if extraction.raw_lines else ""
+        self.logger.debug(
+            "  ↳ zone #%s (%s) %sx%s - nom:%s num:%s set:%s conf:%.2f",
+            idx,
+            candidate.get("orientation"),
+            w,
+            h,
+            extraction.probable_name,
+            extraction.card_number,
+            extraction.set_hint,
+            candidate.get("confidence", 0.0),
+        )
+        return DetectedCardFeatures(
+            bounding_box=(int(x), int(y), int(w), int(h)),
+            raw_text=raw_text,
+            probable_name=extraction.probable_name,
+            local_number=extraction.card_number,
+            set_hint=extraction.set_hint,
+            hp_hint=extraction.hp_hint,
+            type_hint=extraction.types,
+            attacks=extraction.attacks,
+            illustrator_hint=extraction.illustrator,
+            release_year=extraction.release_year,
+            raw_lines=extraction.raw_lines,
+            orientation=candidate.get("orientation", "original"),
+            confidence=candidate.get("confidence", 0.0),
+            quality=quality,
+            quad=quad,
+            ocr_skipped=skip_ocr,
+            image_patch=crop,
+            thumbnail=self._encode_thumbnail(crop),
+        )
 
-        return detections
+    def _encode_thumbnail(self, patch: "np.ndarray") -> Optional[bytes]:
+        """
+        Vignette compacte du crop pour l'UI de revue (évite de servir la photo entière).
+        """
+        if cv2 is None or patch is None or patch.size == 0:
+            return None
+        max_edge = self.settings.analysis_thumbnail_edge
+        h, w = patch.shape[:2]
+        scale = min(1.0, max_edge / float(max(h, w)))
+        if scale < 1.0:
+            patch = cv2.resize(patch, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        quality = self.settings.image_store_quality
+        # Même format que `preview_content_type()`, qui sert ces vignettes.
+        if stored_format() == "webp":
+            ok, buffer = cv2.imencode(".webp", patch, [cv2.IMWRITE_WEBP_QUALITY, quality])
+        else:
+            ok, buffer = cv2.imencode(".jpg", patch, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buffer.tobytes() if ok else None
+
+    # --- Redressement -----------------------------------------------------
+
+    def _rectify_crop(
+        self,
+        image: "np.ndarray",
+        box: Tuple[int, int, int, int],
+    ) -> Tuple["np.ndarray", Optional[List[List[int]]]]:
+        """
+        Détecte le quadrilatère de la carte dans la zone et la redresse à une
+        résolution canonique (portrait), pour un coût OCR/ORB constant par carte.
+        """
+        x, y, w, h = box
+        crop = image[y : y + h, x : x + w]
+        if cv2 is None or crop.size == 0 or not self.settings.analysis_rectify_crops:
+            return crop, None
+
+        quad = self._find_card_quad(crop)
+        if quad is None:
+            quad = np.array([[0, 0], [w - 1, 0], [w - 1, h - 1], [0, h - 1]], dtype=np.float32)
+        ordered = self._order_quad(quad)
+        tl, tr, br, bl = ordered
+        width = max(np.linalg.norm(tr - tl), np.linalg.norm(br - bl))
+        height = max(np.linalg.norm(bl - tl), np.linalg.norm(br - tr))
+        if width > height:
+            # Carte couchée : rotation 90° horaire pour obtenir un portrait.
+            ordered = np.array([bl, tl, tr, br], dtype=np.float32)
+
+        target_w = self.settings.analysis_card_width
+        target_h = self.settings.analysis_card_height
+        destination = np.array(
+            [[0, 0], [target_w - 1, 0], [target_w - 1, target_h - 1], [0, target_h - 1]],
+            dtype=np.float32,
+        )
+        matrix = cv2.getPerspectiveTransform(ordered, destination)
+        warped = cv2.warpPerspective(crop, matrix, (target_w, target_h), flags=cv2.INTER_LINEAR)
+        absolute_quad = [[int(px + x), int(py + y)] for px, py in ordered]
+        return warped, absolute_quad
+
+    def _find_card_quad(self, crop: "np.ndarray") -> Optional["np.ndarray"]:
+        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        edges = cv2.Canny(blurred, 50, 150)
+        edges = cv2.dilate(edges, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)), iterations=1)
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return None
+
+        contour = max(contours, key=cv2.contourArea)
+        crop_area = float(crop.shape[0] * crop.shape[1])
+        if cv2.contourArea(contour) < 0.5 * crop_area:
+            return None
+
+        perimeter = cv2.arcLength(contour, True)
+        approx = cv2.approxPolyDP(contour, 0.02 * perimeter, True)
+        if len(approx) == 4 and cv2.isContourConvex(approx):
+            return approx.reshape(4, 2).astype(np.float32)
+        return cv2.boxPoints(cv2.minAreaRect(contour)).astype(np.float32)
+
+    def _order_quad(self, quad: "np.ndarray") -> "np.ndarray":
+        """
+        Ordonne les coins en (haut-gauche, haut-droit, bas-droit, bas-gauche).
+        """
+        sums = quad.sum(axis=1)
+        diffs = np.diff(quad, axis=1).reshape(-1)
+        return np.array(
+            [
+                quad[np.argmin(sums)],
+                quad[np.argmin(diffs)],
+                quad[np.argmax(sums)],
+                quad[np.argmax(diffs)],
+            ],
+            dtype=np.float32,
+        )
+
+    # --- Qualité -----------------------------------------------------------
+
+    def _assess_quality(self, crop: "np.ndarray") -> Dict[str, object]:
+        """
+        Mesure rapide du flou (variance du Laplacien) et des reflets (part de
+        pixels saturés et peu colorés) sur une version réduite du crop.
+        """
+        if cv2 is None or crop.size == 0:
+            return {"sharpness": 0.0, "glare_ratio": 0.0, "low_quality": False, "reasons": []}
+
+        h, w = crop.shape[:2]
+        scale = min(1.0, 512 / float(max(h, w)))
+        small = crop
+        if scale < 1.0:
+            small = cv2.resize(crop, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        sharpness = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        highlights = (hsv[:, :, 2] >= 245) & (hsv[:, :, 1] <= 40)
+        glare_ratio = float(np.count_nonzero(highlights)) / float(highlights.size)
+
+        reasons: List[str] = []
+        if sharpness < self.settings.analysis_min_sharpness:
+            reasons.append("blur")
+        if glare_ratio > self.settings.analysis_max_glare_ratio:
+            reasons.append("glare")
+
+        return {
+            "sharpness": round(sharpness, 2),
+            "glare_ratio": round(glare_ratio, 4),
+            "low_quality": bool(reasons),
+            "reasons": reasons,
+        }
 
     # --- Détection ---------------------------------------------------------
 
@@ -0,0 +1,114 @@
+"""
+Ré-encodage des photos importées en copie de travail compacte.
+"""
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+from app.config import get_settings
+
+_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+
+@dataclass
+class EncodedImage:
+    data: bytes
+    content_type: str
+    width: int
+    height: int
+    original_size: int
+    preview: Optional[bytes] = None
+
+    @property
+    def stored_size(self) -> int:
+        return len(self.data)
+
+
+def stored_format(image_format: Optional[str] = None) -> str:
+    """
+    Format normalisé (`webp` ou `jpeg`) des images stockées, aperçus et
+    vignettes ; une valeur inconnue retombe sur JPEG.
+    """
+    image_format = (image_format or get_settings().image_store_format).lower()
+    return image_format if image_format in _FORMATS else "jpeg"
+
+
+def preview_content_type() -> str:
+    return _FORMATS[stored_format()][1]
+
+
+def encode_image(
+    content: bytes,
+    *,
+    max_edge: Optional[int] = None,
+    image_format: Optional[str] = None,
+    quality: Optional[int] = None,
+    fallback_content_type: str = "image/jpeg",
+    preview_edge: Optional[int] = None,
+) -> EncodedImage:
+    """
+    Applique l'orientation EXIF, borne le grand côté à `max_edge` et ré-encode
+    en WebP/JPEG. L'original est conservé tel quel si le ré-encodage ne réduit
+    ni la taille ni la résolution.
+    """
+    settings = get_settings()
+    max_edge = max_edge or settings.image_store_max_edge
+    quality = quality or settings.image_store_quality
+    pil_format, content_type = _FORMATS[stored_format(image_format)]
+
+    with Image.open(io.BytesIO(content)) as source:
+        original_size = source.size
+        if source.format == "JPEG":
+            # Décodage DCT à échelle réduite (1/2, 1/4…) : bien moins coûteux
+            # qu'un décodage pleine résolution suivi d'un redimensionnement.
+            source.draft("RGB", (max_edge, max_edge))
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        if max(image.size) > max_edge:
+            image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+
+        save_options = {"quality": quality}
+        if pil_format == "WEBP":
+            save_options["method"] = 2
+        else:
+            save_options["optimize"] = True
+        buffer = io.BytesIO()
+        image.save(buffer, format=pil_format, **save_options)
+        encoded = buffer.getvalue()
+        width, height = image.size
+
+        preview = None
+        if preview_edge:
+            preview_image = image.copy()
+            preview_image.thumbnail((preview_edge, preview_edge), Image.Resampling.BILINEAR)
+            preview_buffer = io.BytesIO()
+            preview_image.save(preview_buffer, format=pil_format, **save_options)
+            preview = preview_buffer.getvalue()
+
+    unchanged_resolution = max(width, height) == max(original_size)
+    if unchanged_resolution and len(encoded) >= len(content):
+        return EncodedImage(
+            data=content,
+            content_type=fallback_content_type,
+            width=width,
+            height=height,
+            original_size=len(content),
+            preview=preview,
+        )
+
+    return EncodedImage(
+        data=encoded,
+        content_type=content_type,
+        width=width,
+        height=height,
+        original_size=len(content),
+        preview=preview,
+    )
@@ -1,14 +1,29 @@
 """
 Service d'accès au cache pour stocker les images d'import.
+
+Deux backends partagent la même interface :
+- `ImageStorageService` (Redis, par défaut) ;
+- `FilesystemImageStorageService` (répertoire local shardé, lectures mmap).
+`get_image_storage()` choisit selon `IMAGE_STORE_BACKEND`.
 """
 from __future__ import annotations
 
+import logging
+import mmap
+import os
+import tempfile
+import time
 import uuid
-from typing import Optional
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
 
 from app.config import get_settings
 from app.services.redis_client import get_redis_client
 
+logger = logging.getLogger("app.storage.images")
+
+ImageBlob = Union[bytes, memoryview]
+
 
 class ImageStorageService:
     def __init__(self, ttl_override: Optional[int] = None) -> None:
@@ -20,20 +35,225 @@ class ImageStorageService:
     def _key(self, image_id: str) -> str:
         return f"{self._prefix}:{image_id}"
 
+    def original_key(self, redis_key: str) -> str:
+        return self.derived_key(redis_key, "original")
+
+    def preview_key(self, redis_key: str) -> str:
+        return self.derived_key(redis_key, "preview")
+
+    def crop_key(self, redis_key: str, draft_id: object) -> str:
+        return self.derived_key(redis_key, f"crop:{draft_id}")
+
+    def derived_key(self, redis_key: str, suffix: str) -> str:
+        """
+        Clé d'un blob dérivé (original, aperçu, vignette) rattaché à une image.
+        """
+        return f"{redis_key}:{suffix}"
+
+    def local_path(self, redis_key: str) -> Optional[Path]:
+        """
+        Chemin local servable directement (FileResponse) ; None pour Redis.
+        """
+        return None
+
     def save_image(self, content: bytes) -> tuple[str, str]:
         """
         Stocke l'image en Redis et retourne (image_id, redis_key).
         """
-        image_id = str(uuid.uuid4())
-        key = self._key(image_id)
-        self._client.setex(key, self._ttl, content)
-        return image_id, key
+        return self.save_many([content])[0]
+
+    def save_many(
+        self,
+        contents: Sequence[bytes],
+        originals: Optional[Sequence[bytes]] = None,
+    ) -> List[tuple[str, str]]:
+        """
+        Stocke plusieurs images en un seul aller-retour (pipeline sans MULTI).
+        Si `originals` est fourni, chaque original est conservé sous
+        `original_key(redis_key)` avec le même TTL.
+        """
+        stored: List[tuple[str, str]] = []
+        if not contents:
+            return stored
+        pipe = self._client.pipeline(transaction=False)
+        for position, content in enumerate(contents):
+            image_id = str(uuid.uuid4())
+            key = self._key(image_id)
+            pipe.setex(key, self._ttl, content)
+            if originals is not None:
+                pipe.setex(self.original_key(key), self._ttl, originals[position])
+            stored.append((image_id, key))
+        pipe.execute()
+        return stored
+
+    def save_derived(self, items: Sequence[tuple[str, bytes]]) -> None:
+        """
+        Stocke des blobs dérivés sous des clés explicites, en un aller-retour.
+        """
+        if not items:
+            return
+        pipe = self._client.pipeline(transaction=False)
+        for key, content in items:
+            pipe.setex(key, self._ttl, content)
+        pipe.execute()
 
-    def fetch_image(self, redis_key: str) -> Optional[bytes]:
+    def fetch_image(self, redis_key: str) -> Optional[ImageBlob]:
         return self._client.get(redis_key)
 
-    def touch(self, redis_key: str) -> None:
-        self._client.expire(redis_key, self._ttl)
+    def fetch_and_touch(self, redis_key: str) -> Optional[ImageBlob]:
+        """
+        Lit l'image et prolonge son TTL en une seule commande (GETEX).
+        """
+        return self._client.getex(redis_key, ex=self._ttl)
+
+    def touch(self, redis_key: str, derived_keys: Sequence[str] = ()) -> None:
+        """
+        Prolonge le TTL de l'image et de ses blobs dérivés (original, aperçu
+        et les vignettes `derived_keys`) en un aller-retour.
+        """
+        pipe = self._client.pipeline(transaction=False)
+        for key in (redis_key, self.original_key(redis_key), self.preview_key(redis_key), *derived_keys):
+            pipe.expire(key, self._ttl)
+        pipe.execute()
 
     def delete(self, redis_key: str) -> None:
-        self._client.delete(redis_key)
+        self.delete_many([redis_key])
+
+    def delete_many(self, redis_keys: Sequence[str]) -> None:
+        """
+        Supprime plusieurs images (et leur original / aperçu) en un seul DEL.
+        """
+        keys = [
+            key
+            for redis_key in redis_keys
+            for key in (redis_key, self.original_key(redis_key), self.preview_key(redis_key))
+        ]
+        if keys:
+            self._client.delete(*keys)
+
+    def sweep_orphans(self) -> int:
+        """
+        Redis expire seul les blobs orphelins : rien à faire.
+        """
+        return 0
+
+
+class FilesystemImageStorageService(ImageStorageService):
+    """
+    Stocke les blobs dans `IMAGE_STORE_DIR/<aa>/<bb>/<uuid>` (shard sur les
+    premiers caractères de l'id). Les lectures passent par mmap et les routes
+    peuvent servir le fichier tel quel via `local_path`.
+
+    L'expiration est portée par `analysis_images.expires_at` (balayée par
+    `AnalysisRetentionService`) et par le mtime des fichiers pour les
+    orphelins (`sweep_orphans`).
+    """
+
+    def __init__(self, ttl_override: Optional[int] = None) -> None:
+        settings = get_settings()
+        self._ttl = ttl_override or settings.image_ttl_seconds
+        self._prefix = "analysis:image"
+        self._root = Path(settings.image_store_dir)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, redis_key: str) -> Path:
+        name = redis_key[len(self._prefix) + 1 :] if redis_key.startswith(self._prefix) else redis_key
+        image_id = name.split(":", 1)[0]
+        return self._root / image_id[:2] / image_id[2:4] / name.replace(":", ".")
+
+    def local_path(self, redis_key: str) -> Optional[Path]:
+        path = self._path(redis_key)
+        return path if path.is_file() else None
+
+    def _write(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handler:
+                handler.write(content)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def save_many(
+        self,
+        contents: Sequence[bytes],
+        originals: Optional[Sequence[bytes]] = None,
+    ) -> List[tuple[str, str]]:
+        stored: List[tuple[str, str]] = []
+        for position, content in enumerate(contents):
+            image_id = str(uuid.uuid4())
+            key = self._key(image_id)
+            self._write(self._path(key), content)
+            if originals is not None:
+                self._write(self._path(self.original_key(key)), originals[position])
+            stored.append((image_id, key))
+        return stored
+
+    def save_derived(self, items: Sequence[tuple[str, bytes]]) -> None:
+        for key, content in items:
+            self._write(self._path(key), content)
+
+    def fetch_image(self, redis_key: str) -> Optional[ImageBlob]:
+        """
+        Retourne une vue mémoire sur le fichier mappé (aucune copie des octets).
+        """
+        path = self._path(redis_key)
+        try:
+            with path.open("rb") as handler:
+                if os.fstat(handler.fileno()).st_size == 0:
+                    return None
+                mapped = mmap.mmap(handler.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        return memoryview(mapped)
+
+    def fetch_and_touch(self, redis_key: str) -> Optional[ImageBlob]:
+        content = self.fetch_image(redis_key)
+        if content is not None:
+            self.touch(redis_key)
+        return content
+
+    def touch(self, redis_key: str, derived_keys: Sequence[str] = ()) -> None:
+        # mtime de l'image et de tous ses blobs dérivés (<uuid>*), lu par sweep_orphans.
+        path = self._path(redis_key)
+        for candidate in path.parent.glob(f"{path.name}*"):
+            try:
+                os.utime(candidate)
+            except FileNotFoundError:
+                continue
+
+    def delete(self, redis_key: str) -> None:
+        path = self._path(redis_key)
+        # L'image et tous ses blobs dérivés (<uuid>.original, <uuid>.crop.*…).
+        for candidate in path.parent.glob(f"{path.name}*"):
+            candidate.unlink(missing_ok=True)
+
+    def delete_many(self, redis_keys: Sequence[str]) -> None:
+        for redis_key in redis_keys:
+            self.delete(redis_key)
+
+    def sweep_orphans(self) -> int:
+        """
+        Retire les fichiers dont le mtime dépasse le TTL (blobs dont la ligne
+        `analysis_images` a disparu ou n'a jamais été créée).
+        """
+        cutoff = time.time() - self._ttl
+        orphans = 0
+        for path in self._root.glob("*/*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                    orphans += 1
+            except FileNotFoundError:
+                continue
+        if orphans:
+            logger.info("🧹 %s fichier(s) orphelin(s) supprimé(s)", orphans)
+        return orphans
+
+
+def get_image_storage(ttl_override: Optional[int] = None) -> ImageStorageService:
+    if get_settings().image_store_backend == "filesystem":
+        return FilesystemImageStorageService(ttl_override)
+    return ImageStorageService(ttl_override)
@@ -3,50 +3,279 @@ Gestion de la progression des master sets utilisateur.
 """
 from __future__ import annotations
 
+import logging
+from collections import Counter
 from datetime import datetime
+from typing import Iterable, List, Optional, Set as SetType
 from sqlalchemy.orm import Session
-from sqlalchemy import func, distinct
+from sqlalchemy import Numeric, and_, case, cast, distinct, exists, func, select, update
 
 from app.models.card import Card
 from app.models.user_card import UserCard
 from app.models.user_master_set import UserMasterSet
 from app.models.set import Set
 
+logger = logging.getLogger("app.master_set")
+
+
+def _completion(owned, tracked):
+    return case(
+        (tracked > 0, func.round(cast(owned, Numeric) / tracked, 4)),
+        else_=0.0,
+    )
+
 
 class MasterSetProgressService:
+    """
+    Les compteurs `owned_card_count` sont maintenus par delta à chaque écriture
+    dans la collection (`record_changes`) ; `sync_progress_many` recompte
+    explicitement et `reconcile_all` corrige en masse toute dérive.
+    """
+
     def __init__(self, db: Session):
         self.db = db
 
-    def sync_progress(self, user_id: int, set_id: str) -> UserMasterSet:
-        set_obj = self.db.query(Set).filter(Set.id == set_id).first()
-        tracked_count = set_obj.card_count_total or set_obj.card_count_official or 0
-
-        master_set = (
+    def get(self, user_id: int, set_id: str) -> Optional[UserMasterSet]:
+        return (
             self.db.query(UserMasterSet)
             .filter(UserMasterSet.user_id == user_id, UserMasterSet.set_id == set_id)
             .first()
         )
 
-        if not master_set:
-            master_set = UserMasterSet(
+    def get_many(self, user_id: int, set_ids: Iterable[str]) -> List[UserMasterSet]:
+        set_ids = list(dict.fromkeys(set_ids))
+        if not set_ids:
+            return []
+        return (
+            self.db.query(UserMasterSet)
+            .filter(UserMasterSet.user_id == user_id, UserMasterSet.set_id.in_(set_ids))
+            .order_by(UserMasterSet.set_id)
+            .all()
+        )
+
+    def owned_card_ids(self, user_id: int, card_ids: Iterable[str]) -> SetType[str]:
+        """
+        Cartes parmi `card_ids` présentes (au moins un exemplaire) dans la collection.
+        """
+        card_ids = set(card_ids)
+        if not card_ids:
+            return set()
+        return {
+            card_id
+            for (card_id,) in self.db.query(UserCard.card_id)
+            .filter(UserCard.user_id == user_id, UserCard.card_id.in_(card_ids))
+            .distinct()
+        }
+
+    def record_changes(
+        self,
+        user_id: int,
+        added: Iterable[str] = (),
+        removed: Iterable[str] = (),
+        create_missing: bool = True,
+    ) -> List[str]:
+        """
+        Applique les deltas de possession : `added` = cartes devenues possédées,
+        `removed` = cartes dont le dernier exemplaire a été retiré. Une requête
+        UPDATE atomique par set concerné ; un master set absent est créé par un
+        recomptage complet si `create_missing`. Retourne les sets touchés.
+        """
+        added, removed = set(added), set(removed)
+        if not added and not removed:
+            return []
+        self.db.flush()
+
+        set_by_card = dict(
+            self.db.query(Card.id, Card.set_id).filter(Card.id.in_(added | removed))
+        )
+        deltas: Counter = Counter()
+        for card_id in added:
+            deltas[set_by_card[card_id]] += 1
+        for card_id in removed:
+            deltas[set_by_card[card_id]] -= 1
+
+        existing = {
+            set_id
+            for (set_id,) in self.db.query(UserMasterSet.set_id).filter(
+                UserMasterSet.user_id == user_id, UserMasterSet.set_id.in_(list(deltas))
+            )
+        }
+        now = datetime.utcnow()
+        for set_id, delta in deltas.items():
+            if set_id not in existing or delta == 0:
+                continue
+            owned = func.greatest(UserMasterSet.owned_card_count + delta, 0)
+            self.db.execute(
+                update(UserMasterSet)
+                .where(UserMasterSet.user_id == user_id, UserMasterSet.set_id == set_id)
+                .values(
+                    owned_card_count=owned,
+                    completion_rate=_completion(owned, UserMasterSet.tracked_card_count),
+                    updated_at=now,
+                )
+                .execution_options(synchronize_session="fetch")
+            )
+
+        missing = [set_id for set_id in deltas if set_id not in existing]
+        if create_missing and missing:
+            self.sync_progress_many(user_id, missing)
+        return list(deltas)
+
+    def dashboard(self, user_id: int, include_all: bool = False) -> List[dict]:
+        """
+        Progression de l'utilisateur sur chaque set touché (ou sur tous les sets
+        avec `include_all`) : un seul agrégat GROUP BY set_id sur user_cards.
+        """
+        owned = (
+            select(Card.set_id, func.count(distinct(UserCard.card_id)).label("owned"))
+            .join(Card, Card.id == UserCard.card_id)
+            .where(UserCard.user_id == user_id)
+            .group_by(Card.set_id)
+            .subquery()
+        )
+        tracked = func.coalesce(Set.card_count_total, Set.card_count_official, 0)
+        rows = self.db.execute(
+            select(
+                Set.id,
+                Set.name,
+                Set.series_id,
+                Set.logo,
+                Set.release_date,
+                tracked.label("tracked"),
+                func.coalesce(owned.c.owned, 0).label("owned"),
+            )
+            .join(owned, owned.c.set_id == Set.id, isouter=include_all)
+            .order_by(Set.release_date.desc().nulls_last(), Set.id)
+        ).all()
+        return [
+            {
+                "set_id": row.id,
+                "set_name": row.name,
+                "series_id": row.series_id,
+                "logo": row.logo,
+                "release_date": row.release_date.isoformat() if row.release_date else None,
+                "tracked_card_count": row.tracked,
+                "owned_card_count": row.owned,
+                "completion_rate": round(row.owned / row.tracked, 4) if row.tracked else 0.0,
+            }
+            for row in rows
+        ]
+
+    def sync_progress(self, user_id: int, set_id: str) -> UserMasterSet:
+        return self.sync_progress_many(user_id, [set_id])[0]
+
+    def sync_progress_many(self, user_id: int, set_ids: Iterable[str]) -> List[UserMasterSet]:
+        """
+        Recalcule la progression de plusieurs sets en trois requêtes (sets,
+        master sets existants, comptage groupé par set), quel que soit leur nombre.
+        """
+        set_ids = list(dict.fromkeys(set_ids))
+        if not set_ids:
+            return []
+
+        tracked_counts = {
+            set_id: total or official or 0
+            for set_id, total, official in self.db.query(
+                Set.id, Set.card_count_total, Set.card_count_official
+            ).filter(Set.id.in_(set_ids))
+        }
+        master_sets = {
+            master_set.set_id: master_set
+            for master_set in self.db.query(UserMasterSet).filter(
+                UserMasterSet.user_id == user_id, UserMasterSet.set_id.in_(set_ids)
+            )
+        }
+        missing = [set_id for set_id in set_ids if set_id not in master_sets]
+        for set_id in missing:
+            master_sets[set_id] = UserMasterSet(
                 user_id=user_id,
                 set_id=set_id,
-                tracked_card_count=tracked_count,
+                tracked_card_count=tracked_counts.get(set_id, 0),
                 owned_card_count=0,
                 completion_rate=0.0,
             )
-            self.db.add(master_set)
+            self.db.add(master_sets[set_id])
+        if missing:
             self.db.flush()
 
-        owned_cards = (
-            self.db.query(func.count(distinct(UserCard.card_id)))
+        owned_counts = dict(
+            self.db.query(Card.set_id, func.count(distinct(UserCard.card_id)))
+            .join(Card, Card.id == UserCard.card_id)
+            .filter(UserCard.user_id == user_id, Card.set_id.in_(set_ids))
+            .group_by(Card.set_id)
+            .all()
+        )
+
+        now = datetime.utcnow()
+        for set_id in set_ids:
+            master_set = master_sets[set_id]
+            tracked_count = tracked_counts.get(set_id, 0)
+            owned_cards = owned_counts.get(set_id, 0)
+            completion = (owned_cards / tracked_count) if tracked_count else 0.0
+            master_set.owned_card_count = owned_cards
+            master_set.completion_rate = round(completion, 4)
+            master_set.last_synced_at = now
+        return [master_sets[set_id] for set_id in set_ids]
+
+    def reconcile_all(self) -> int:
+        """
+        Recalcule en masse tous les master sets (quelques UPDATE ensemblistes)
+        et retourne le nombre de lignes corrigées.
+        """
+        ums = UserMasterSet.__table__
+        now = datetime.utcnow()
+        corrected = 0
+
+        tracked = func.coalesce(Set.card_count_total, Set.card_count_official, 0)
+        self.db.execute(
+            update(ums)
+            .where(Set.id == ums.c.set_id, ums.c.tracked_card_count != tracked)
+            .values(tracked_card_count=tracked, updated_at=now)
+        )
+
+        counts = (
+            select(
+                UserCard.user_id,
+                Card.set_id,
+                func.count(distinct(UserCard.card_id)).label("owned"),
+            )
             .join(Card, Card.id == UserCard.card_id)
-            .filter(UserCard.user_id == user_id, Card.set_id == set_id)
-            .scalar()
-        ) or 0
-
-        completion = (owned_cards / tracked_count) if tracked_count else 0.0
-        master_set.owned_card_count = owned_cards
-        master_set.completion_rate = round(completion, 4)
-        master_set.last_synced_at = datetime.utcnow()
-        return master_set
+            .group_by(UserCard.user_id, Card.set_id)
+            .subquery()
+        )
+        result = self.db.execute(
+            update(ums)
+            .where(
+                ums.c.user_id == counts.c.user_id,
+                ums.c.set_id == counts.c.set_id,
+                ums.c.owned_card_count != counts.c.owned,
+            )
+            .values(owned_card_count=counts.c.owned, last_synced_at=now, updated_at=now)
+        )
+        corrected += result.rowcount
+
+        still_owned = exists().where(
+            and_(
+                UserCard.user_id == ums.c.user_id,
+                Card.id == UserCard.card_id,
+                Card.set_id == ums.c.set_id,
+            )
+        )
+        result = self.db.execute(
+            update(ums)
+            .where(ums.c.owned_card_count != 0, ~still_owned)
+            .values(owned_card_count=0, last_synced_at=now, updated_at=now)
+        )
+        corrected += result.rowcount
+
+        completion = _completion(ums.c.owned_card_count, ums.c.tracked_card_count)
+        self.db.execute(
+            update(ums)
+            .where(func.abs(ums.c.completion_rate - completion) > 0.00005)
+            .values(completion_rate=completion)
+        )
+        self.db.commit()
+
+        if corrected:
+            logger.info("🔧 %s master set(s) recalculé(s)", corrected)
+        return corrected
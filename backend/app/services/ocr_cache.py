@@ -0,0 +1,183 @@
+"""
+Cache Redis des résultats OCR, indexé par hash perceptuel du segment normalisé.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.redis_client import get_redis_client
+
+logger = logging.getLogger("app.analysis.ocr_cache")
+
+try:
+    import cv2  # type: ignore
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore
+
+try:
+    from redis.exceptions import RedisError  # type: ignore
+except Exception:  # pragma: no cover
+    RedisError = Exception  # type: ignore
+
+
+# Entrées par bucket au-delà desquelles une entrée au hasard est évincée.
+_MAX_BUCKET_ENTRIES = 32
+
+
+class OcrResultCache:
+    """
+    Évite de relancer la reconnaissance sur des crops quasi identiques
+    (ré-uploads, nouvelles photos d'une même carte, plusieurs photos d'une
+    même page de classeur).
+
+    Chaque segment a deux dHash : un grossier (4x4, 16 bits) qui désigne le
+    bucket Redis avec le segment et les langues OCR, et un complet
+    (`OCR_CACHE_HASH_SIZE`², 256 bits par défaut) comparé aux entrées du
+    bucket. Seule une entrée à moins de `OCR_CACHE_MAX_DISTANCE` bits
+    (distance de Hamming) est servie : 64 bits ne suffisaient pas à
+    distinguer les zones de texte de cartes différentes. Chaque lecture
+    prolonge le TTL du bucket, ce qui donne une éviction de type LRU couplée
+    à la politique `maxmemory-policy` de Redis.
+    """
+
+    # Compteurs du process courant, partagés entre instances.
+    process_hits = 0
+    process_misses = 0
+
+    def __init__(self) -> None:
+        settings = get_settings()
+        self._enabled = settings.ocr_cache_enabled and cv2 is not None
+        self._ttl = settings.ocr_cache_ttl_seconds
+        self._hash_size = settings.ocr_cache_hash_size
+        self._max_distance = settings.ocr_cache_max_distance
+        self._prefix = "analysis:ocr"
+        self._stats_key = f"{self._prefix}:stats"
+        self._client = get_redis_client() if self._enabled else None
+
+    def enabled(self) -> bool:
+        return self._enabled and self._client is not None
+
+    def perceptual_hash(self, image: "np.ndarray", hash_size: int) -> Optional[str]:
+        """
+        dHash : compare chaque pixel à son voisin de droite sur une vignette
+        (hash_size+1) x hash_size, robuste aux légères variations d'exposition.
+        """
+        if cv2 is None or image is None or image.size == 0:
+            return None
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        thumb = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+        diff = thumb[:, 1:] > thumb[:, :-1]
+        bits = np.packbits(diff.flatten())
+        return bits.tobytes().hex()
+
+    @staticmethod
+    def _distance(left: str, right: str) -> int:
+        if len(left) != len(right):
+            return len(left) * 4
+        return bin(int(left, 16) ^ int(right, 16)).count("1")
+
+    def _key(self, segment: str, coarse_hash: str, languages: Sequence[str]) -> str:
+        lang_key = "+".join(sorted(languages))
+        return f"{self._prefix}:{lang_key}:{segment}:{coarse_hash}"
+
+    def get(
+        self, segment: str, image: "np.ndarray", languages: Sequence[str]
+    ) -> tuple[Optional[Tuple[str, str]], Optional[List[str]]]:
+        """
+        Retourne ((bucket, hash complet), lignes) ; `lignes` vaut None en cas de miss.
+        """
+        if not self.enabled():
+            return None, None
+        coarse_hash = self.perceptual_hash(image, 4)
+        full_hash = self.perceptual_hash(image, self._hash_size)
+        if coarse_hash is None or full_hash is None:
+            return None, None
+        key = self._key(segment, coarse_hash, languages)
+        try:
+            pipe = self._client.pipeline(transaction=False)  # type: ignore[union-attr]
+            pipe.hgetall(key)
+            pipe.expire(key, self._ttl)
+            entries, _ = pipe.execute()
+        except RedisError as exc:
+            logger.debug("Cache OCR indisponible (%s)", exc)
+            return (key, full_hash), None
+
+        best, best_distance = None, self._max_distance + 1
+        for stored_hash, cached in (entries or {}).items():
+            distance = self._distance(full_hash, stored_hash.decode("ascii"))
+            if distance < best_distance:
+                best, best_distance = cached, distance
+
+        if best is None:
+            self._record(hit=False)
+            return (key, full_hash), None
+
+        self._record(hit=True)
+        try:
+            return (key, full_hash), json.loads(best)
+        except ValueError:
+            return (key, full_hash), None
+
+    def set(self, handle: Optional[Tuple[str, str]], lines: List[str]) -> None:
+        if not handle or not self.enabled():
+            return
+        key, full_hash = handle
+        try:
+            pipe = self._client.pipeline(transaction=False)  # type: ignore[union-attr]
+            pipe.hset(key, full_hash, json.dumps(lines, ensure_ascii=False))
+            pipe.hlen(key)
+            pipe.expire(key, self._ttl)
+            _, size, _ = pipe.execute()
+            if size > _MAX_BUCKET_ENTRIES:
+                evicted = [
+                    field
+                    for field in self._client.hrandfield(key, 2) or []  # type: ignore[union-attr]
+                    if field.decode("ascii") != full_hash
+                ]
+                if evicted:
+                    self._client.hdel(key, evicted[0])  # type: ignore[union-attr]
+        except RedisError as exc:
+            logger.debug("Écriture cache OCR impossible (%s)", exc)
+
+    def _record(self, *, hit: bool) -> None:
+        field = "hits" if hit else "misses"
+        if hit:
+            OcrResultCache.process_hits += 1
+        else:
+            OcrResultCache.process_misses += 1
+        try:
+            self._client.hincrby(self._stats_key, field, 1)  # type: ignore[union-attr]
+        except RedisError:
+            pass
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Compteurs globaux (tous workers) et locaux (process courant).
+        """
+        payload: Dict[str, object] = {
+            "enabled": self.enabled(),
+            "ttl_seconds": self._ttl,
+            "process": {"hits": OcrResultCache.process_hits, "misses": OcrResultCache.process_misses},
+        }
+        if not self.enabled():
+            return payload
+        try:
+            raw = self._client.hgetall(self._stats_key) or {}  # type: ignore[union-attr]
+        except RedisError:
+            return payload
+        hits = int(raw.get(b"hits", 0))
+        misses = int(raw.get(b"misses", 0))
+        total = hits + misses
+        payload.update(
+            {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+            }
+        )
+        return payload
@@ -2,11 +2,43 @@
 Client Redis partagé pour le stockage temporaire des images.
 """
 from functools import lru_cache
+from typing import Dict
+
 import redis
 from app.config import get_settings
 
 
 @lru_cache(maxsize=1)
-def get_redis_client() -> redis.Redis:
+def get_redis_pool() -> redis.BlockingConnectionPool:
+    """
+    Pool bloquant dimensionné explicitement : au-delà de `redis_max_connections`,
+    les appels attendent `redis_pool_timeout` secondes au lieu d'ouvrir des
+    connexions sans limite.
+    """
     settings = get_settings()
-    return redis.Redis.from_url(settings.redis_url, decode_responses=False)
+    return redis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        health_check_interval=30,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_redis_client() -> redis.Redis:
+    return redis.Redis(connection_pool=get_redis_pool())
+
+
+def get_pool_metrics() -> Dict[str, int]:
+    pool = get_redis_pool()
+    created = len(getattr(pool, "_connections", []))
+    idle_queue = getattr(pool, "pool", None)
+    idle = sum(1 for conn in getattr(idle_queue, "queue", []) if conn is not None)
+    return {
+        "max_connections": pool.max_connections,
+        "created": created,
+        "in_use": max(0, created - idle),
+        "idle": idle,
+    }
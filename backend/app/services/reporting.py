@@ -1,30 +1,140 @@
+import gzip
 import json
 import logging
+import os
+import shutil
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.config import get_settings
 
 logger = logging.getLogger("app.analysis.report")
 
+try:  # pragma: no cover - dépendance optionnelle
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def dumps_compact(payload: Dict[str, Any]) -> bytes:
+    """
+    Sérialise en JSON compact (orjson si disponible, json sinon).
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=str)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
 
 class AnalysisReportWriter:
     """
-    Persiste un snapshot JSON des analyses pour faciliter le debug et l'audit.
+    Persiste un snapshot des analyses pour faciliter le debug et l'audit.
+
+    Chaque batch est une ligne JSON ajoutée (membre gzip) au fichier
+    `<ANALYSIS_OUTPUT_DIR>/<AAAA-MM-JJ>/batches-<pid>.jsonl.gz` : un fichier par
+    jour et par worker, sans verrou inter-process. Les validations de drafts
+    suivent le même schéma dans `selections-<pid>.jsonl.gz`, pour que la
+    télémétrie (précision top-1 comprise) puisse être reconstruite depuis les
+    rapports. `prune` applique la rétention.
     """
 
+    _lock = Lock()
+
     def __init__(self) -> None:
         settings = get_settings()
         self._output_dir = Path(settings.analysis_output_dir)
         self._output_dir.mkdir(parents=True, exist_ok=True)
+        self._include_ocr_lines = settings.analysis_report_include_ocr_lines
+        self._retention_days = settings.analysis_report_retention_days
+        self._max_bytes = settings.analysis_report_max_mb * 1024 * 1024
+
+    def report_path(self, when: Optional[datetime] = None, kind: str = "batches") -> Path:
+        when = when or datetime.utcnow()
+        return self._output_dir / when.strftime("%Y-%m-%d") / f"{kind}-{os.getpid()}.jsonl.gz"
+
+    def _compact(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self._include_ocr_lines:
+            return payload
+        drafts = []
+        for draft in payload.get("drafts", []):
+            metadata = draft.get("detected_metadata")
+            if isinstance(metadata, dict) and "raw_lines" in metadata:
+                metadata = {key: value for key, value in metadata.items() if key != "raw_lines"}
+                draft = {**draft, "detected_metadata": metadata}
+            drafts.append(draft)
+        return {**payload, "drafts": drafts}
+
+    def _append(self, path: Path, data: bytes) -> bool:
+        try:
+            with AnalysisReportWriter._lock:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(path, "ab", compresslevel=6) as handler:
+                    handler.write(data)
+        except OSError as exc:
+            # Exécuté hors requête : une erreur d'écriture ne doit rien casser.
+            logger.warning("Écriture du rapport %s impossible (%s)", path, exc)
+            return False
+        return True
+
+    def write_batch(self, payload: Dict[str, Any], path: Optional[Path] = None) -> Path:
+        path = path or self.report_path()
+        line = dumps_compact(self._compact(payload)) + b"\n"
+        if self._append(path, line):
+            logger.info("✅ Rapport d'analyse ajouté à %s", path)
+        return path
+
+    def write_selections(self, selections: List[Tuple[str, str]], auto: bool = False) -> Path:
+        """
+        Ajoute des couples (draft_id, card_id) validés, une ligne par validation.
+        """
+        now = datetime.utcnow()
+        path = self.report_path(now, kind="selections")
+        lines = b"".join(
+            dumps_compact(
+                {"draft_id": str(draft_id), "card_id": card_id, "selected_at": now.isoformat(), "auto": auto}
+            )
+            + b"\n"
+            for draft_id, card_id in selections
+        )
+        if lines:
+            self._append(path, lines)
+        return path
+
+    def prune(self) -> int:
+        """
+        Supprime les partitions de plus de ANALYSIS_REPORT_RETENTION_DAYS jours,
+        puis les plus anciennes tant que le total dépasse ANALYSIS_REPORT_MAX_MB.
+        Retourne le nombre de partitions supprimées.
+        """
+        partitions = sorted(
+            (entry for entry in self._output_dir.iterdir() if entry.is_dir() and self._is_partition(entry.name)),
+            key=lambda entry: entry.name,
+        )
+        cutoff = time.strftime("%Y-%m-%d", time.gmtime(time.time() - self._retention_days * 86400))
+        today = datetime.utcnow().strftime("%Y-%m-%d")
 
-    def write_batch(self, payload: Dict[str, Any]) -> Path:
-        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-        filename = self._output_dir / f"batch_{payload.get('batch_id')}_{timestamp}.json"
+        removed = 0
+        sizes = {entry: sum(f.stat().st_size for f in entry.glob("*") if f.is_file()) for entry in partitions}
+        total = sum(sizes.values())
+        for entry in partitions:
+            too_old = self._retention_days > 0 and entry.name < cutoff
+            too_big = self._max_bytes > 0 and total > self._max_bytes
+            if not (too_old or too_big) or entry.name == today:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+            removed += 1
 
-        with filename.open("w", encoding="utf-8") as handler:
-            json.dump(payload, handler, ensure_ascii=False, indent=2)
+        if removed:
+            logger.info("🧹 %s partition(s) de rapports supprimée(s)", removed)
+        return removed
 
-        logger.info("✅ Rapport d'analyse écrit dans %s", filename)
-        return filename
+    @staticmethod
+    def _is_partition(name: str) -> bool:
+        try:
+            datetime.strptime(name, "%Y-%m-%d")
+        except ValueError:
+            return False
+        return True
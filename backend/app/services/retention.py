@@ -0,0 +1,156 @@
+"""
+Expiration et purge des données d'analyse (images et drafts).
+"""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.analysis_image import AnalysisImage
+from app.models.card_draft import CardDraft, CardDraftStatus
+from app.models.user_card import UserCard
+from app.services.image_store import ImageStorageService, get_image_storage
+
+logger = logging.getLogger("app.retention")
+
+OPEN_DRAFT_STATUSES = (
+    CardDraftStatus.pending.value,
+    CardDraftStatus.deferred.value,
+    CardDraftStatus.awaiting_validation.value,
+)
+PURGEABLE_DRAFT_STATUSES = (
+    CardDraftStatus.expired.value,
+    CardDraftStatus.rejected.value,
+)
+
+
+class AnalysisRetentionService:
+    """
+    Balayage périodique des tables d'analyse, par lots et en SQL ensembliste :
+
+    1. les images dont `expires_at` est dépassé passent "expired" (blobs supprimés) ;
+    2. les drafts encore ouverts au-delà de `ANALYSIS_DRAFT_RETENTION_HOURS`
+       passent "expired" ;
+    3. au-delà de `ANALYSIS_PURGE_AFTER_DAYS`, les drafts expirés/rejetés non
+       rattachés à la collection puis les images expirées sans draft sont supprimés.
+
+    Les drafts validés (référencés par `user_cards.draft_id`) et leurs images
+    sont conservés.
+    """
+
+    def __init__(self, storage: Optional[ImageStorageService] = None, batch_size: Optional[int] = None) -> None:
+        settings = get_settings()
+        self.storage = storage or get_image_storage()
+        self.batch_size = batch_size or settings.analysis_sweep_batch_size
+        self.draft_retention = timedelta(hours=settings.analysis_draft_retention_hours)
+        self.purge_after_days = settings.analysis_purge_after_days
+
+    def run(self, db: Session) -> Dict[str, int]:
+        now = datetime.utcnow()
+        stats = {
+            "images_expired": self.expire_images(db, now),
+            "drafts_expired": self.expire_drafts(db, now),
+            "drafts_purged": 0,
+            "images_purged": 0,
+            "orphan_files": self.storage.sweep_orphans(),
+        }
+        if self.purge_after_days > 0:
+            cutoff = now - timedelta(days=self.purge_after_days)
+            stats["drafts_purged"] = self.purge_drafts(db, cutoff)
+            stats["images_purged"] = self.purge_images(db, cutoff)
+
+        if any(stats.values()):
+            logger.info("🧹 Rétention analyse : %s", stats)
+        return stats
+
+    def expire_images(self, db: Session, now: datetime) -> int:
+        total = 0
+        while True:
+            rows = db.execute(
+                select(AnalysisImage.id, AnalysisImage.redis_key)
+                .where(AnalysisImage.status.in_(("stored", "analyzed")), AnalysisImage.expires_at < now)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                return total
+            self.storage.delete_many([redis_key for _, redis_key in rows])
+            db.execute(
+                update(AnalysisImage)
+                .where(AnalysisImage.id.in_([image_id for image_id, _ in rows]))
+                .values(status="expired", updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            total += len(rows)
+
+    def expire_drafts(self, db: Session, now: datetime) -> int:
+        cutoff = now - self.draft_retention
+        total = 0
+        while True:
+            batch = (
+                select(CardDraft.id)
+                .where(CardDraft.status.in_(OPEN_DRAFT_STATUSES), CardDraft.created_at < cutoff)
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            result = db.execute(
+                update(CardDraft)
+                .where(CardDraft.id.in_(batch))
+                .values(status=CardDraftStatus.expired.value, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                return total
+
+    def purge_drafts(self, db: Session, cutoff: datetime) -> int:
+        total = 0
+        while True:
+            batch = (
+                select(CardDraft.id)
+                .where(
+                    CardDraft.status.in_(PURGEABLE_DRAFT_STATUSES),
+                    CardDraft.created_at < cutoff,
+                    ~exists().where(UserCard.draft_id == CardDraft.id),
+                )
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            result = db.execute(
+                delete(CardDraft)
+                .where(CardDraft.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                return total
+
+    def purge_images(self, db: Session, cutoff: datetime) -> int:
+        total = 0
+        while True:
+            batch = (
+                select(AnalysisImage.id)
+                .where(
+                    AnalysisImage.status == "expired",
+                    AnalysisImage.expires_at < cutoff,
+                    ~exists().where(CardDraft.image_id == AnalysisImage.id),
+                )
+                .limit(self.batch_size)
+                .scalar_subquery()
+            )
+            result = db.execute(
+                delete(AnalysisImage)
+                .where(AnalysisImage.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            total += result.rowcount
+            if result.rowcount < self.batch_size:
+                return total
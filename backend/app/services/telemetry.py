@@ -0,0 +1,299 @@
+"""
+Télémétrie locale du pipeline d'analyse : chronométrage des étapes et
+stockage SQLite indexé des batches, détections et sélections.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger("app.analysis.telemetry")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    batch_id TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    user_id INTEGER,
+    subject_type TEXT,
+    languages TEXT,
+    files INTEGER,
+    drafts INTEGER,
+    deferred INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_batches_day ON batches (day);
+
+CREATE TABLE IF NOT EXISTS stage_timings (
+    batch_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    PRIMARY KEY (batch_id, stage)
+);
+CREATE INDEX IF NOT EXISTS ix_stage_timings_day_stage ON stage_timings (day, stage);
+
+CREATE TABLE IF NOT EXISTS detections (
+    draft_id TEXT PRIMARY KEY,
+    batch_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    status TEXT,
+    confidence REAL,
+    candidates INTEGER,
+    candidates_scored INTEGER,
+    top_candidate_id TEXT,
+    top_score REAL,
+    runner_up_score REAL,
+    ocr_skipped INTEGER,
+    deferred INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_detections_day ON detections (day);
+CREATE INDEX IF NOT EXISTS ix_detections_batch ON detections (batch_id);
+
+CREATE TABLE IF NOT EXISTS selections (
+    draft_id TEXT PRIMARY KEY,
+    card_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    selected_at TEXT NOT NULL,
+    auto INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_selections_day ON selections (day);
+"""
+
+
+class StageTimer:
+    """
+    Cumule des durées par étape (ms) : `with timer.stage("encode"): ...`.
+    """
+
+    def __init__(self) -> None:
+        self._durations: Dict[str, float] = defaultdict(float)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._durations[name] += (time.perf_counter() - started) * 1000
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(duration, 2) for name, duration in self._durations.items()}
+
+
+def _percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(ratio * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class AnalysisTelemetryStore:
+    """
+    Base SQLite (`ANALYSIS_TELEMETRY_DB`) alimentée en tâche de fond par les
+    imports et validations, ou reconstruite depuis les rapports `.jsonl.gz`.
+    """
+
+    _lock = Lock()
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = Path(path or get_settings().analysis_telemetry_db)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    # --- Écriture ---------------------------------------------------------
+
+    def record_batch(self, payload: Dict[str, Any]) -> None:
+        try:
+            with AnalysisTelemetryStore._lock, self._connect() as conn:
+                self._insert_batch(conn, payload)
+        except sqlite3.Error as exc:
+            logger.warning("Télémétrie du batch %s non enregistrée (%s)", payload.get("batch_id"), exc)
+
+    def record_selection(self, draft_id: str, card_id: str, auto: bool = False) -> None:
+        self.record_selections([(draft_id, card_id)], auto=auto)
+
+    def record_selections(self, selections: List[Tuple[str, str]], auto: bool = False) -> None:
+        """
+        Enregistre des couples (draft_id, card_id) validés.
+        """
+        selected_at = datetime.utcnow().isoformat()
+        rows = [(str(draft_id), card_id, selected_at, auto) for draft_id, card_id in selections]
+        try:
+            with AnalysisTelemetryStore._lock, self._connect() as conn:
+                self._insert_selections(conn, rows)
+        except sqlite3.Error as exc:
+            logger.warning("Télémétrie de %s sélection(s) non enregistrée (%s)", len(rows), exc)
+
+    def ingest_reports(self, directory: Path) -> Tuple[int, int]:
+        """
+        Rejoue les rapports `*/batches-*.jsonl.gz` et `*/selections-*.jsonl.gz`
+        (idempotent). Retourne le nombre de batches et de sélections lus.
+        """
+        batches = selections = 0
+        with AnalysisTelemetryStore._lock, self._connect() as conn:
+            for payload in self._read_reports(directory, "batches"):
+                self._insert_batch(conn, payload)
+                batches += 1
+            rows = [
+                (row.get("draft_id"), row.get("card_id"), row.get("selected_at"), row.get("auto"))
+                for row in self._read_reports(directory, "selections")
+            ]
+            self._insert_selections(conn, rows)
+            selections = len(rows)
+        return batches, selections
+
+    @staticmethod
+    def _read_reports(directory: Path, kind: str) -> Iterator[Dict[str, Any]]:
+        for path in sorted(directory.glob(f"*/{kind}-*.jsonl.gz")):
+            with gzip.open(path, "rt", encoding="utf-8") as handler:
+                for line in handler:
+                    if line.strip():
+                        yield json.loads(line)
+
+    @staticmethod
+    def _insert_selections(conn: sqlite3.Connection, rows: List[Tuple[Any, Any, Any, Any]]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO selections (draft_id, card_id, day, selected_at, auto) VALUES (?, ?, ?, ?, ?)",
+            [
+                (draft_id, card_id, selected_at[:10], selected_at, int(bool(auto)))
+                for draft_id, card_id, selected_at, auto in rows
+            ],
+        )
+
+    def _insert_batch(self, conn: sqlite3.Connection, payload: Dict[str, Any]) -> None:
+        batch_id = str(payload.get("batch_id"))
+        created_at = payload.get("created_at") or datetime.utcnow().isoformat()
+        day = created_at[:10]
+        stats = payload.get("stats") or {}
+        conn.execute(
+            "INSERT OR REPLACE INTO batches VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                batch_id,
+                day,
+                created_at,
+                payload.get("user_id"),
+                payload.get("subject_type"),
+                ",".join(payload.get("languages") or []),
+                stats.get("files"),
+                stats.get("drafts"),
+                stats.get("deferred"),
+            ),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO stage_timings VALUES (?, ?, ?, ?)",
+            [(batch_id, day, stage, duration) for stage, duration in (payload.get("timings") or {}).items()],
+        )
+        rows = []
+        for draft in payload.get("drafts") or []:
+            metadata = draft.get("detected_metadata") or {}
+            candidates = draft.get("candidates") or []
+            rows.append(
+                (
+                    draft.get("draft_id"),
+                    batch_id,
+                    day,
+                    draft.get("status"),
+                    metadata.get("confidence"),
+                    len(candidates),
+                    metadata.get("candidates_scored"),
+                    draft.get("top_candidate_id"),
+                    draft.get("top_candidate_score"),
+                    candidates[1].get("score") if len(candidates) > 1 else None,
+                    int(bool(metadata.get("ocr_skipped"))),
+                    int(bool(metadata.get("deferred"))),
+                )
+            )
+        conn.executemany("INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    # --- Agrégats ---------------------------------------------------------
+
+    def daily_accuracy(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Part des validations manuelles où la carte choisie était le premier
+        candidat (les validations automatiques sont exclues).
+        """
+        query = """
+            SELECT s.day, COUNT(*), SUM(CASE WHEN d.top_candidate_id = s.card_id THEN 1 ELSE 0 END)
+            FROM selections s JOIN detections d ON d.draft_id = s.draft_id
+            WHERE s.day >= ? AND s.auto = 0 GROUP BY s.day ORDER BY s.day
+        """
+        with self._connect() as conn:
+            rows = conn.execute(query, (since or "",)).fetchall()
+        return [
+            {"day": day, "selections": total, "top1": hits, "top1_accuracy": round(hits / total, 4) if total else 0.0}
+            for day, total, hits in rows
+        ]
+
+    def daily_candidates(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = """
+            SELECT day, COUNT(*), AVG(candidates_scored), AVG(candidates), AVG(top_score),
+                   SUM(ocr_skipped), SUM(deferred)
+            FROM detections WHERE day >= ? GROUP BY day ORDER BY day
+        """
+        with self._connect() as conn:
+            rows = conn.execute(query, (since or "",)).fetchall()
+        return [
+            {
+                "day": day,
+                "detections": count,
+                "mean_candidates_scored": round(scored or 0.0, 1),
+                "mean_candidates_returned": round(returned or 0.0, 2),
+                "mean_top_score": round(top or 0.0, 4),
+                "ocr_skipped": skipped,
+                "deferred": deferred,
+            }
+            for day, count, scored, returned, top, skipped, deferred in rows
+        ]
+
+    def daily_stage_latency(self, since: Optional[str] = None, ratio: float = 0.95) -> List[Dict[str, Any]]:
+        query = "SELECT day, stage, duration_ms FROM stage_timings WHERE day >= ? ORDER BY day, stage"
+        grouped: Dict[tuple, List[float]] = defaultdict(list)
+        with self._connect() as conn:
+            for day, stage, duration in conn.execute(query, (since or "",)):
+                grouped[(day, stage)].append(duration)
+        return [
+            {
+                "day": day,
+                "stage": stage,
+                "batches": len(values),
+                "p50_ms": round(_percentile(values, 0.5), 1),
+                f"p{int(ratio * 100)}_ms": round(_percentile(values, ratio), 1),
+            }
+            for (day, stage), values in grouped.items()
+        ]
+
+
+_store: Optional[AnalysisTelemetryStore] = None
+
+
+def get_telemetry_store() -> Optional[AnalysisTelemetryStore]:
+    """
+    Store partagé, ou None si `ANALYSIS_TELEMETRY_DB` est vide.
+    """
+    global _store
+    if not get_settings().analysis_telemetry_db:
+        return None
+    if _store is None:
+        _store = AnalysisTelemetryStore()
+    return _store
@@ -0,0 +1,105 @@
+"""
+Écritures ensemblistes dans la collection (`user_cards`).
+
+Une ligne par couple (user_id, card_id), garantie par l'index unique
+`ix_user_cards_user_id_card_id` : les ajouts passent par un seul
+`INSERT ... ON CONFLICT (user_id, card_id) DO UPDATE` qui incrémente la
+quantité des cartes déjà possédées.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set as SetType
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.orm import Session
+
+from app.models.user_card import CURRENT_XACT_ID, CardCondition, UserCard
+from app.services.master_set import MasterSetProgressService
+
+_COLUMNS = ("card_id", "draft_id", "quantity", "condition", "price_paid", "acquired_at", "source", "notes")
+
+
+@dataclass
+class UpsertResult:
+    user_cards: Dict[str, UserCard] = field(default_factory=dict)
+    created: SetType[str] = field(default_factory=set)
+
+    @property
+    def updated(self) -> SetType[str]:
+        return set(self.user_cards) - self.created
+
+
+def merge_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Fusionne les lignes visant la même carte (quantités cumulées, dernières
+    valeurs non vides retenues) : une même clé ne peut apparaître qu'une fois
+    dans un INSERT ... ON CONFLICT DO UPDATE.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        current = merged.get(row["card_id"])
+        if current is None:
+            current = merged[row["card_id"]] = {column: row.get(column) for column in _COLUMNS}
+            current["quantity"] = current["quantity"] or 1
+            current["condition"] = current["condition"] or CardCondition.near_mint.value
+            continue
+        current["quantity"] += row.get("quantity") or 1
+        for column in _COLUMNS:
+            if column not in ("card_id", "quantity") and row.get(column) not in (None, ""):
+                current[column] = row[column]
+    return list(merged.values())
+
+
+# xmax = 0 : ligne insérée par la requête (et non mise à jour).
+INSERTED = literal_column("xmax = 0").label("inserted")
+
+
+def on_conflict_increment(stmt: Insert) -> Insert:
+    """
+    Sur conflit (user_id, card_id) : quantité incrémentée, autres champs
+    remplacés s'ils sont fournis.
+    """
+    excluded = stmt.excluded
+    values = {
+        "quantity": UserCard.quantity + excluded.quantity,
+        "condition": excluded.condition,
+        "price_paid": func.coalesce(excluded.price_paid, UserCard.price_paid),
+        "acquired_at": func.coalesce(excluded.acquired_at, UserCard.acquired_at),
+        "source": func.coalesce(func.nullif(excluded.source, ""), UserCard.source),
+        "notes": func.coalesce(func.nullif(excluded.notes, ""), UserCard.notes),
+        "draft_id": func.coalesce(excluded.draft_id, UserCard.draft_id),
+        "updated_at": func.clock_timestamp(),
+        "change_xid": literal_column(CURRENT_XACT_ID),
+    }
+    return stmt.on_conflict_do_update(index_elements=[UserCard.user_id, UserCard.card_id], set_=values)
+
+
+class UserCardWriter:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def upsert(self, user_id: int, rows: Iterable[Dict[str, Any]], track_master_sets: bool = True) -> UpsertResult:
+        """
+        Ajoute les cartes en une requête : création ou incrément de quantité
+        (état, prix, date, source, notes et draft remplacés s'ils sont fournis).
+        Les cartes nouvellement possédées mettent à jour les master sets.
+        """
+        values = [{**row, "user_id": user_id} for row in merge_rows(rows)]
+        result = UpsertResult()
+        if not values:
+            return result
+
+        stmt = on_conflict_increment(insert(UserCard).values(values))
+        for user_card, was_inserted in self.db.execute(
+            stmt.returning(UserCard, INSERTED),
+            execution_options={"populate_existing": True},
+        ):
+            result.user_cards[user_card.card_id] = user_card
+            if was_inserted:
+                result.created.add(user_card.card_id)
+
+        if track_master_sets and result.created:
+            MasterSetProgressService(self.db).record_changes(user_id, added=result.created)
+        return result
@@ -0,0 +1,103 @@
+"""
+Utilitaires HTTP pour servir des blobs immuables : ETag, requêtes
+conditionnelles (If-None-Match) et requêtes partielles (Range).
+"""
+import hashlib
+from typing import Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+
+def content_etag(content) -> str:
+    """
+    ETag fort dérivé du contenu (SHA-256 hexadécimal, entre guillemets).
+    """
+    return f'"{hashlib.sha256(content).hexdigest()}"'
+
+
+def quote_etag(value: str) -> str:
+    return value if value.startswith('"') else f'"{value}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Vrai si l'en-tête If-None-Match du client désigne `etag` (ou "*").
+    Comparaison faible, comme l'exige la RFC 9110 pour If-None-Match.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interprète un en-tête `Range: bytes=...` mono-intervalle.
+
+    Retourne (début, fin incluse), None si l'en-tête est absent ou ignoré
+    (unité inconnue, plusieurs intervalles) ; lève ValueError si l'intervalle
+    n'est pas satisfaisable.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if not start_text:
+            # bytes=-N : les N derniers octets.
+            length = int(end_text)
+            if length <= 0:
+                raise ValueError("intervalle vide")
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError as exc:
+        raise ValueError("Range invalide") from exc
+    if start >= size or end < start:
+        raise ValueError("Range non satisfaisable")
+    return start, min(end, size - 1)
+
+
+def blob_response(
+    request: Request,
+    content,
+    media_type: str,
+    headers: dict,
+) -> Response:
+    """
+    Sert un blob en mémoire (bytes ou memoryview) en honorant Range / If-Range.
+    `headers` doit déjà contenir l'ETag et le Cache-Control.
+    """
+    size = len(content)
+    headers = {**headers, "Accept-Ranges": "bytes"}
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != headers.get("ETag"):
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return Response(content=bytes(content), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    return Response(
+        content=bytes(content[start : end + 1]),
+        status_code=206,
+        media_type=media_type,
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"},
+    )
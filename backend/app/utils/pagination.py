@@ -0,0 +1,53 @@
+"""
+Pagination par curseur (keyset) : le curseur opaque encode les valeurs de
+la clé de tri de la dernière ligne servie, la page suivante est lue avec
+`(col1, col2, ...) > (v1, v2, ...)` sur un index, sans OFFSET.
+"""
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Valeurs de la clé de tri contenues dans `cursor`, une par type attendu
+    dans `types` (HTTP 400 si illisible ou mal formé).
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or not all(isinstance(value, kind) for value, kind in zip(values, types))
+    ):
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+    return values
+
+
+def after(columns: Sequence[Any], values: Sequence[Any]):
+    """
+    Condition « ligne strictement après `values` » selon l'ordre de `columns`.
+    """
+    return tuple_(*columns) > tuple_(*values)
+
+
+def next_cursor(rows: list, limit: int, key) -> Optional[str]:
+    """
+    Curseur de la page suivante à partir de `limit + 1` lignes lues (la ligne
+    en trop est retirée de `rows`), ou None s'il s'agit de la dernière page.
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    return encode_cursor(key(rows[-1]))
@@ -0,0 +1,22 @@
+"""Add ocr_languages to users
+
+Revision ID: 2025010603
+Revises: 2025010602
+Create Date: 2025-01-06 18:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "2025010603"
+down_revision = "2025010602"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("ocr_languages", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "ocr_languages")
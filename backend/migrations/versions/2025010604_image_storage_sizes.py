@@ -0,0 +1,26 @@
+"""Track original vs stored image sizes
+
+Revision ID: 2025010604
+Revises: 2025010603
+Create Date: 2025-01-07 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "2025010604"
+down_revision = "2025010603"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("analysis_images", sa.Column("original_size_bytes", sa.Integer(), nullable=True))
+    op.add_column("analysis_images", sa.Column("stored_size_bytes", sa.Integer(), nullable=True))
+    op.add_column("analysis_images", sa.Column("original_redis_key", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("analysis_images", "original_redis_key")
+    op.drop_column("analysis_images", "stored_size_bytes")
+    op.drop_column("analysis_images", "original_size_bytes")
@@ -0,0 +1,22 @@
+"""Store a content hash for stored images (HTTP ETag)
+
+Revision ID: 2025010605
+Revises: 2025010604
+Create Date: 2025-01-08 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "2025010605"
+down_revision = "2025010604"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("analysis_images", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("analysis_images", "content_sha256")
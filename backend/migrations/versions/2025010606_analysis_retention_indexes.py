@@ -0,0 +1,27 @@
+"""Indexes for the analysis retention sweeper
+
+Revision ID: 2025010606
+Revises: 2025010605
+Create Date: 2025-01-08 10:00:00.000000
+"""
+from alembic import op
+
+
+revision = "2025010606"
+down_revision = "2025010605"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_analysis_images_status_expires_at", "analysis_images", ["status", "expires_at"], unique=False)
+    op.create_index("ix_card_drafts_status_created_at", "card_drafts", ["status", "created_at"], unique=False)
+    op.create_index(op.f("ix_card_drafts_image_id"), "card_drafts", ["image_id"], unique=False)
+    op.create_index(op.f("ix_user_cards_draft_id"), "user_cards", ["draft_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_user_cards_draft_id"), table_name="user_cards")
+    op.drop_index(op.f("ix_card_drafts_image_id"), table_name="card_drafts")
+    op.drop_index("ix_card_drafts_status_created_at", table_name="card_drafts")
+    op.drop_index("ix_analysis_images_status_expires_at", table_name="analysis_images")
@@ -0,0 +1,23 @@
+"""Indexes for set missing/owned card lookups
+
+Revision ID: 2025010607
+Revises: 2025010606
+Create Date: 2025-01-09 10:00:00.000000
+"""
+from alembic import op
+
+
+revision = "2025010607"
+down_revision = "2025010606"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_cards_set_id_local_id", "cards", ["set_id", "local_id"], unique=False)
+    op.create_index("ix_user_cards_user_id_card_id", "user_cards", ["user_id", "card_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_cards_user_id_card_id", table_name="user_cards")
+    op.drop_index("ix_cards_set_id_local_id", table_name="cards")
@@ -0,0 +1,50 @@
+"""Unique (user_id, card_id) on user_cards, merging existing duplicates
+
+Revision ID: 2025010608
+Revises: 2025010607
+Create Date: 2025-01-09 14:00:00.000000
+"""
+from alembic import op
+
+
+revision = "2025010608"
+down_revision = "2025010607"
+branch_labels = None
+depends_on = None
+
+
+_RANKED = """
+    WITH ranked AS (
+        SELECT
+            id,
+            row_number() OVER (PARTITION BY user_id, card_id ORDER BY created_at, id) AS position,
+            sum(quantity) OVER (PARTITION BY user_id, card_id) AS total
+        FROM user_cards
+    )
+"""
+
+
+def upgrade() -> None:
+    # Les doublons sont fusionnés dans la ligne la plus ancienne (quantités cumulées).
+    op.execute(
+        _RANKED
+        + """
+        UPDATE user_cards SET quantity = ranked.total, updated_at = now()
+        FROM ranked
+        WHERE user_cards.id = ranked.id AND ranked.position = 1 AND user_cards.quantity <> ranked.total
+        """
+    )
+    op.execute(
+        _RANKED
+        + """
+        DELETE FROM user_cards USING ranked
+        WHERE user_cards.id = ranked.id AND ranked.position > 1
+        """
+    )
+    op.drop_index("ix_user_cards_user_id_card_id", table_name="user_cards")
+    op.create_index("ix_user_cards_user_id_card_id", "user_cards", ["user_id", "card_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_cards_user_id_card_id", table_name="user_cards")
+    op.create_index("ix_user_cards_user_id_card_id", "user_cards", ["user_id", "card_id"], unique=False)
@@ -0,0 +1,25 @@
+"""Indexes for keyset pagination of cards and user_cards
+
+Revision ID: 2025010609
+Revises: 2025010608
+Create Date: 2025-01-10 10:00:00.000000
+"""
+from alembic import op
+
+
+revision = "2025010609"
+down_revision = "2025010608"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_cards_set_id_local_id", table_name="cards")
+    op.create_index("ix_cards_set_id_local_id_id", "cards", ["set_id", "local_id", "id"], unique=False)
+    op.create_index("ix_user_cards_user_id_created_at_id", "user_cards", ["user_id", "created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_cards_user_id_created_at_id", table_name="user_cards")
+    op.drop_index("ix_cards_set_id_local_id_id", table_name="cards")
+    op.create_index("ix_cards_set_id_local_id", "cards", ["set_id", "local_id"], unique=False)
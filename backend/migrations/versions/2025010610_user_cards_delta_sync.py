@@ -0,0 +1,41 @@
+"""Delta sync for user_cards: updated_at on insert, index and tombstones
+
+Revision ID: 2025010610
+Revises: 2025010609
+Create Date: 2025-01-10 14:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "2025010610"
+down_revision = "2025010609"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE user_cards SET updated_at = created_at WHERE updated_at IS NULL")
+    op.alter_column("user_cards", "updated_at", server_default=sa.text("clock_timestamp()"))
+    op.create_index("ix_user_cards_user_id_updated_at", "user_cards", ["user_id", "updated_at"], unique=False)
+
+    op.create_table(
+        "user_card_tombstones",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("card_id", sa.String(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), server_default=sa.text("clock_timestamp()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_user_card_tombstones_user_id_deleted_at", "user_card_tombstones", ["user_id", "deleted_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_card_tombstones_user_id_deleted_at", table_name="user_card_tombstones")
+    op.drop_table("user_card_tombstones")
+    op.drop_index("ix_user_cards_user_id_updated_at", table_name="user_cards")
+    op.alter_column("user_cards", "updated_at", server_default=None)
@@ -0,0 +1,36 @@
+"""Commit-ordered delta sync: change_xid on user_cards and tombstones
+
+Revision ID: 2025010611
+Revises: 2025010610
+Create Date: 2025-01-11 09:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "2025010611"
+down_revision = "2025010610"
+branch_labels = None
+depends_on = None
+
+CURRENT_XACT_ID = sa.text("pg_current_xact_id()::text::bigint")
+
+
+def upgrade() -> None:
+    op.add_column("user_cards", sa.Column("change_xid", sa.BigInteger(), server_default=CURRENT_XACT_ID, nullable=False))
+    op.add_column(
+        "user_card_tombstones", sa.Column("change_xid", sa.BigInteger(), server_default=CURRENT_XACT_ID, nullable=False)
+    )
+    op.drop_index("ix_user_cards_user_id_updated_at", table_name="user_cards")
+    op.create_index("ix_user_cards_user_id_change_xid_id", "user_cards", ["user_id", "change_xid", "id"], unique=False)
+    op.create_index(
+        "ix_user_card_tombstones_user_id_change_xid", "user_card_tombstones", ["user_id", "change_xid"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_card_tombstones_user_id_change_xid", table_name="user_card_tombstones")
+    op.drop_index("ix_user_cards_user_id_change_xid_id", table_name="user_cards")
+    op.create_index("ix_user_cards_user_id_updated_at", "user_cards", ["user_id", "updated_at"], unique=False)
+    op.drop_column("user_card_tombstones", "change_xid")
+    op.drop_column("user_cards", "change_xid")
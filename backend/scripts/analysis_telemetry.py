@@ -0,0 +1,64 @@
+"""
+Agrégats de télémétrie du pipeline d'analyse (base SQLite ANALYSIS_TELEMETRY_DB).
+Usage :
+  PYTHONPATH=. python scripts/analysis_telemetry.py ingest [dossier_rapports]
+  PYTHONPATH=. python scripts/analysis_telemetry.py summary [--since AAAA-MM-JJ] [--percentile 0.95]
+"""
+import argparse
+from pathlib import Path
+
+from app.config import get_settings
+from app.services.telemetry import AnalysisTelemetryStore
+
+
+def ingest(store: AnalysisTelemetryStore, directory: Path) -> None:
+    batches, selections = store.ingest_reports(directory)
+    print(f"📥 {batches} batch(s) et {selections} validation(s) importé(s) depuis {directory} vers {store.path}")
+
+
+def summary(store: AnalysisTelemetryStore, since: str, ratio: float) -> None:
+    print("🎯 Précision top-1 (validations)")
+    print(f"{'Jour':<12} {'Validées':>9} {'Top-1':>7} {'Précision':>10}")
+    for row in store.daily_accuracy(since):
+        print(f"{row['day']:<12} {row['selections']:>9} {row['top1']:>7} {row['top1_accuracy']:>10.1%}")
+
+    print("\n🔎 Candidats")
+    print(f"{'Jour':<12} {'Détections':>10} {'Évalués':>8} {'Retournés':>10} {'Score top':>10} {'Floues':>7} {'Différées':>10}")
+    for row in store.daily_candidates(since):
+        print(
+            f"{row['day']:<12} {row['detections']:>10} {row['mean_candidates_scored']:>8.1f} "
+            f"{row['mean_candidates_returned']:>10.2f} {row['mean_top_score']:>10.3f} "
+            f"{row['ocr_skipped']:>7} {row['deferred']:>10}"
+        )
+
+    label = f"p{int(ratio * 100)}_ms"
+    print(f"\n⏱️  Latence par étape (ms, p50 / {label[:-3]})")
+    print(f"{'Jour':<12} {'Étape':<10} {'Batches':>8} {'p50':>9} {label[:-3]:>9}")
+    for row in store.daily_stage_latency(since, ratio):
+        print(f"{row['day']:<12} {row['stage']:<10} {row['batches']:>8} {row['p50_ms']:>9.1f} {row[label]:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=None, help="Chemin de la base (défaut : ANALYSIS_TELEMETRY_DB)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser(
+        "ingest", help="Rejoue les rapports de batches et de validations (.jsonl.gz) dans la base"
+    )
+    ingest_parser.add_argument("directory", nargs="?", default=None)
+
+    summary_parser = commands.add_parser("summary", help="Agrégats par jour")
+    summary_parser.add_argument("--since", default="", help="Premier jour inclus (AAAA-MM-JJ)")
+    summary_parser.add_argument("--percentile", type=float, default=0.95)
+
+    args = parser.parse_args()
+    store = AnalysisTelemetryStore(args.db or get_settings().analysis_telemetry_db or "output/telemetry.sqlite3")
+    if args.command == "ingest":
+        ingest(store, Path(args.directory or get_settings().analysis_output_dir))
+    else:
+        summary(store, args.since, args.percentile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Rapport de la mémoire Redis économisée par le ré-encodage des images d'import.
+Usage : PYTHONPATH=. python scripts/image_storage_report.py [dossier]
+"""
+import sys
+import time
+from pathlib import Path
+
+from app.config import get_settings
+from app.services.image_codec import encode_image
+
+DEFAULT_DIR = Path(__file__).resolve().parent.parent / "app" / "examples"
+
+
+def main(directory: Path) -> None:
+    settings = get_settings()
+    files = sorted(p for p in directory.iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp"})
+    if not files:
+        print(f"Aucune image dans {directory}")
+        return
+
+    print(
+        f"📐 Grand côté max {settings.image_store_max_edge}px, "
+        f"{settings.image_store_format.upper()} q{settings.image_store_quality}\n"
+    )
+    print(f"{'Fichier':<32} {'Original':>10} {'Stocké':>10} {'Gain':>7} {'Résolution':>11} {'ms':>6}")
+
+    total_original = 0
+    total_stored = 0
+    for path in files:
+        content = path.read_bytes()
+        started = time.perf_counter()
+        encoded = encode_image(content)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        total_original += encoded.original_size
+        total_stored += encoded.stored_size
+        saving = 1 - encoded.stored_size / encoded.original_size
+        print(
+            f"{path.name:<32} {encoded.original_size / 1024:>8.0f}Ko {encoded.stored_size / 1024:>8.0f}Ko "
+            f"{saving:>6.1%} {encoded.width:>5}x{encoded.height:<5} {elapsed_ms:>6.0f}"
+        )
+
+    saving = 1 - total_stored / total_original
+    print(
+        f"\n✅ Total : {total_original / 1024 / 1024:.1f} Mo → {total_stored / 1024 / 1024:.1f} Mo "
+        f"({saving:.1%} de mémoire Redis économisée)"
+    )
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DIR)
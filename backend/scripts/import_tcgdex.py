@@ -9,6 +9,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, engine, Base
 from app.models import Series, Set, Card
+from app.services.collection_cache import CollectionCache
 
 
 
@@ -225,6 +226,8 @@ def import_all_cards(db: Session, sets_dict: dict):
         total_cards += count
         print(f"    ✅ {count} cartes importées")
     
+    # Les vues en cache « cartes d'un set + collection » sont à recalculer
+    CollectionCache().bump_catalog()
     print(f"✅ {total_cards} cartes importées au total")
 
 
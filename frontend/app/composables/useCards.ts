@@ -31,6 +31,8 @@ export const useCards = () => {
 		appendParam("local_id", filters?.local_id);
 		appendParam("skip", filters?.skip);
 		appendParam("limit", filters?.limit);
+		appendParam("cursor", filters?.cursor);
+		if (filters?.include_total) params.append("include_total", "true");
 
 		const queryString = params.toString();
 		const url = queryString ? `/cards/?${queryString}` : "/cards/";
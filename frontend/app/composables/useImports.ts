@@ -1,4 +1,6 @@
 import type {
+	BatchSelectionItem,
+	BatchSelectionResponse,
 	CardSelectionPayload,
 	CardSelectionResponse,
 	ImportBatchResponse,
@@ -16,11 +18,19 @@ export const useImports = () => {
 
 	const uploadBatch = async (
 		files: File[],
-		subjectType: SubjectType
+		subjectType: SubjectType,
+		languages?: string[],
+		autoAccept = false
 	): Promise<ImportBatchResponse> => {
 		const formData = new FormData();
 		files.forEach((file) => formData.append("files", file));
 		formData.append("subject_type", subjectType);
+		if (languages?.length) {
+			formData.append("languages", languages.join(","));
+		}
+		if (autoAccept) {
+			formData.append("auto_accept", "true");
+		}
 
 		return await $fetch<ImportBatchResponse>("/imports/batches", {
 			baseURL,
@@ -56,9 +66,26 @@ export const useImports = () => {
 		});
 	};
 
+	const selectBatch = async (
+		batchId: string,
+		selections: BatchSelectionItem[]
+	): Promise<BatchSelectionResponse> => {
+		return await $fetch<BatchSelectionResponse>(`/imports/batches/${batchId}/select`, {
+			baseURL,
+			method: "POST",
+			credentials: "include",
+			headers: {
+				"Content-Type": "application/json",
+				...authHeaders(),
+			},
+			body: { selections },
+		});
+	};
+
 	return {
 		uploadBatch,
 		fetchBatch,
 		selectDraft,
+		selectBatch,
 	};
 };
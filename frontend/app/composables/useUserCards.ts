@@ -1,4 +1,4 @@
-import type { UserCard, UserCardsResponse, UserCardCreate } from "~/types/api";
+import type { MasterSetDashboard, OwnedSetCardRow, SetCardRow, SetCollection, UserCardChanges, UserCard, UserCardsResponse, UserCardCreate } from "~/types/api";
 
 /**
  * Composable pour gérer les cartes de l'utilisateur
@@ -8,13 +8,15 @@ export const useUserCards = () => {
 
 	/**
 	 * Récupérer les cartes de l'utilisateur avec pagination
+	 * (offset, ou `cursor` = `next_cursor` de la page précédente)
 	 */
-	const getUserCards = (skip = 0, limit = 20, cardId?: string, setId?: string) => {
+	const getUserCards = (skip = 0, limit = 20, cardId?: string, setId?: string, cursor?: string) => {
 		const params = new URLSearchParams();
 		params.append("skip", skip.toString());
 		params.append("limit", limit.toString());
 		if (cardId) params.append("card_id", cardId);
 		if (setId) params.append("set_id", setId);
+		if (cursor) params.append("cursor", cursor);
 
 		return api.get<UserCardsResponse>(`/user-cards/?${params.toString()}`);
 	};
@@ -56,8 +58,53 @@ export const useUserCards = () => {
 		return await api.delete(`/user-cards/${userCardId}`);
 	};
 
+	/**
+	 * Progression de la collection sur chaque set
+	 */
+	const getMasterSets = (includeAll = false) => {
+		return api.get<MasterSetDashboard>(`/users/me/master-sets?include_all=${includeAll}`);
+	};
+
+	/**
+	 * Cartes d'un set manquantes dans la collection
+	 */
+	const getMissingCards = (setId: string) => {
+		return api.get<SetCardRow[]>(`/sets/${encodeURIComponent(setId)}/missing`);
+	};
+
+	/**
+	 * Cartes d'un set possédées (avec quantité)
+	 */
+	const getOwnedCards = (setId: string) => {
+		return api.get<OwnedSetCardRow[]>(`/sets/${encodeURIComponent(setId)}/owned`);
+	};
+
+	/**
+	 * Toutes les cartes d'un set avec l'état de la collection (une requête)
+	 */
+	const getSetCollection = (setId: string) => {
+		return api.get<SetCollection>(`/sets/${encodeURIComponent(setId)}/collection`);
+	};
+
+	/**
+	 * Modifications de la collection depuis le jeton `since` (`next_token` précédent),
+	 * page suivante du même delta avec `cursor` (`next_cursor` précédent)
+	 */
+	const getChanges = (since?: string, cursor?: string) => {
+		const params = new URLSearchParams();
+		if (since) params.append("since", since);
+		if (cursor) params.append("cursor", cursor);
+		const query = params.toString();
+		return api.get<UserCardChanges>(`/user-cards/changes${query ? `?${query}` : ""}`);
+	};
+
 	return {
 		getUserCards,
+		getChanges,
+		getSetCollection,
+		getMasterSets,
+		getMissingCards,
+		getOwnedCards,
 		addUserCard,
 		addUserCardsBatch,
 		updateUserCard,
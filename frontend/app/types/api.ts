@@ -54,13 +54,17 @@ export interface CardFilters {
 	local_id?: string;
 	skip?: number;
 	limit?: number;
+	cursor?: string;
+	include_total?: boolean;
 }
 
 export interface CardsResponse {
 	items: Card[];
-	total: number;
+	/** Absent en mode curseur sans `include_total` */
+	total: number | null;
 	skip: number;
 	limit: number;
+	next_cursor: string | null;
 }
 
 export interface SetFilters {
@@ -82,6 +86,13 @@ export interface DetectedMetadata {
 	illustrator_hint?: string;
 	release_year?: string;
 	raw_lines?: string[];
+	quality?: {
+		sharpness: number;
+		glare_ratio: number;
+		low_quality: boolean;
+		reasons: string[];
+	} | null;
+	ocr_skipped?: boolean | null;
 }
 
 export interface CardCandidate {
@@ -99,6 +110,8 @@ export interface CardDraft {
 	batch_id: string;
 	image_id: string;
 	image_url: string;
+	preview_url?: string | null;
+	crop_url?: string | null;
 	status: string;
 	subject_type: SubjectType;
 	candidates: CardCandidate[];
@@ -112,6 +125,7 @@ export interface ImportBatchResponse {
 	batch_id: string;
 	drafts: CardDraft[];
 	report_path?: string | null;
+	auto_accepted?: number;
 }
 
 export interface CardSelectionPayload {
@@ -151,6 +165,7 @@ export interface UserCardsResponse {
 	total: number;
 	skip: number;
 	limit: number;
+	next_cursor: string | null;
 }
 
 export interface UserCardCreate {
@@ -173,8 +188,94 @@ export interface UserMasterSet {
 	status: string;
 }
 
+export interface MasterSetProgress {
+	set_id: string;
+	set_name: string;
+	series_id?: string | null;
+	logo?: string | null;
+	release_date?: string | null;
+	tracked_card_count: number;
+	owned_card_count: number;
+	completion_rate: number;
+}
+
+export interface SetCardRow {
+	id: string;
+	local_id: string;
+	name: string;
+	rarity?: string | null;
+	image?: string | null;
+}
+
+export interface OwnedSetCardRow extends SetCardRow {
+	quantity: number;
+}
+
+/** Ligne de `SetCollection.cards`, dans l'ordre de `columns` */
+export type SetCollectionRow = [
+	id: string,
+	local_id: string,
+	name: string,
+	rarity: string | null,
+	image: string | null,
+	user_card_id: string | null,
+	quantity: number,
+	condition: string | null,
+];
+
+export interface SetCollection {
+	set_id: string;
+	columns: string[];
+	cards: SetCollectionRow[];
+	total: number;
+	owned: number;
+	cached: boolean;
+}
+
+export interface UserCardChange {
+	id: string;
+	card_id: string;
+	quantity: number;
+	condition: string;
+	price_paid?: number | null;
+	acquired_at?: string | null;
+	source?: string | null;
+	notes?: string | null;
+	created_at: string;
+	updated_at?: string | null;
+}
+
+export interface UserCardChanges {
+	items: UserCardChange[];
+	deleted: { id: string; card_id: string; deleted_at: string }[];
+	next_token: string;
+	/** Page suivante du même delta (null sur la dernière) */
+	next_cursor?: string | null;
+	/** Liste complète (première page) : remplace la copie locale */
+	reset: boolean;
+}
+
+export interface MasterSetDashboard {
+	items: MasterSetProgress[];
+	owned_card_count: number;
+	tracked_card_count: number;
+	cached: boolean;
+}
+
 export interface CardSelectionResponse {
 	draft: CardDraft;
 	user_card: UserCard;
 	master_set?: UserMasterSet | null;
 }
+
+export interface BatchSelectionItem extends CardSelectionPayload {
+	draft_id: string;
+}
+
+export interface BatchSelectionResponse {
+	batch_id: string;
+	drafts: CardDraft[];
+	user_cards: UserCard[];
+	master_sets: UserMasterSet[];
+	errors: { draft_id: string; detail: string }[];
+}